@@ -1,168 +1,401 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 import asyncio
 import os
-import json
-import pandas as pd
-from datetime import datetime
-from core.fetch_matches import fetch_matches
-from core.utils import get_logger
+import time
+import uuid
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timezone
+from core.crawl_planner import LEAGUE_PAGES, crawl_dates, dedupe_matches, sport_key
+from core.scheduler import ScrapeScheduler
+from core.result_store import ResultStore
+from core.odds_stream import OddsBroadcaster
+from core.metrics import render_latest
+from core.warmup import Warmup
+from core.utils import get_logger, log_context
 from utils.user_agent_pool import get_random_user_agent
+from utils.proxy_pool import get_proxy_manager
 
 app = FastAPI(title="OddsPortal Scraper API")
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 logger = get_logger("api")
 
-# Store scraped data temporarily
-scraped_data = []
-
-
-
-@app.get("/health")
-async def health_check():
-    """Check if the API is running."""
-    return {"status": "API is running"}
-
-
-
-
-
-
-
-
-
-
-
+# Shared by every uvicorn worker; each keeps a decoded copy of the latest generation
+RESULTS_DB = os.getenv("RESULTS_DB", "./output/results.sqlite")
+result_store = ResultStore(RESULTS_DB)
 
+# Websocket subscribers of this worker, fed a delta whenever it loads a new generation
+odds_broadcaster = OddsBroadcaster()
+# Seconds between store checks while anyone is subscribed
+STREAM_POLL_INTERVAL = 1.0
 
+# The scraper (pandas, Playwright) loads in the background so /health answers at once
+warmup = Warmup()
 
+# This worker's copy of the latest scrape
+scraped_data = []
+scraped_etag = None
+scraped_kickoffs = []
+scraped_generation = 0
 
 
+def load_results(generation, etag, matches):
+    global scraped_data, scraped_etag, scraped_kickoffs, scraped_generation
+    if generation != scraped_generation:
+        odds_broadcaster.publish(generation, scraped_generation, scraped_data, matches)
+    scraped_data = matches
+    scraped_kickoffs = [m.get("datetime") or "" for m in matches]
+    scraped_etag = etag
+    scraped_generation = generation
 
 
+def sync_results(force=False):
+    """Pick up a scrape stored by any worker since this one last looked."""
+    latest = result_store.poll(scraped_generation, force=force)
+    if latest:
+        load_results(*latest)
 
 
+def store_matches(matches, sports=None, dates=None):
+    """Publish the dataset to every worker as a new generation.
 
+    With `sports`, only matches of those planner sport keys are replaced and
+    the rest of the latest stored scrape is kept. With `dates` as well, a
+    daily sport's matches are only replaced on those listing dates (league
+    pages cover the whole season, so theirs are always replaced).
+    """
+    replaced = set(sports) if sports is not None else None
+    days = {day.isoformat() for day in dates} if dates else None
 
+    def is_replaced(match):
+        sport = sport_key(match)
+        if sport not in replaced:
+            return False
+        # Listings are rendered in UTC, so a match's listing date is its UTC kickoff date
+        return days is None or sport in LEAGUE_PAGES or (match.get("datetime") or "")[:10] in days
 
+    def merge(current):
+        merged = matches
+        if replaced is not None:
+            kept = [m for m in current if not is_replaced(m)]
+            merged = dedupe_matches(matches + kept)
+        # Kept in kickoff order (UTC ISO strings sort chronologically) so time
+        # windows are a bisect away; matches without a kickoff sort first.
+        return sorted(merged, key=lambda m: m.get("datetime") or "")
 
+    load_results(*result_store.write(merge))
 
 
+def matches_between(start: datetime | None, end: datetime | None) -> list[dict]:
+    """Matches kicking off in [start, end), via bisect over the sorted kickoffs."""
+    if start is None and end is None:
+        return scraped_data
+    lo = bisect_left(scraped_kickoffs, utc_iso(start)) if start else 0
+    hi = bisect_left(scraped_kickoffs, utc_iso(end)) if end else len(scraped_data)
+    if not start:
+        # Skip matches with no kickoff at all
+        lo = bisect_right(scraped_kickoffs, "")
+    return scraped_data[lo:hi]
 
 
+def utc_iso(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
 
 
+def etag_for(suffix=""):
+    return f'{scraped_etag[:-1]}-{suffix}"' if suffix else scraped_etag
 
 
+def not_modified(request: Request, etag: str):
+    """Return a 304 response if the client already holds this ETag."""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
 
 
+def active_proxy_manager():
+    """The shared proxy manager when USE_PROXIES=1, otherwise scrape directly."""
+    return get_proxy_manager() if os.getenv("USE_PROXIES", "0") == "1" else None
 
 
+# More than 1 shards each crawl over that many worker processes
+SCRAPE_PROCESSES = int(os.getenv("SCRAPE_PROCESSES", "1"))
 
 
+async def crawl(**kwargs):
+    """Run one crawl on this event loop, or sharded across SCRAPE_PROCESSES processes."""
+    await warmup.load()
+    from core.fetch_matches import fetch_matches
+    from core.sharded_crawl import fetch_matches_sharded
 
+    if SCRAPE_PROCESSES > 1:
+        return await fetch_matches_sharded(processes=SCRAPE_PROCESSES,
+                                           use_proxies=active_proxy_manager() is not None, **kwargs)
+    manager = active_proxy_manager()
+    try:
+        return await fetch_matches(proxy_manager=manager, **kwargs)
+    finally:
+        if manager:
+            # /proxies answers from any worker, so share the pool as this crawl left it
+            result_store.set_state("proxies", {"pid": os.getpid(), "reported_at": time.time(),
+                                               "proxies": manager.snapshot()})
+
+
+async def refresh_listing(sport, day=None):
+    """Scheduled refresh of one sport's listing for `day` (None for a league page), merged into the stored results."""
+    with log_context(job=f"schedule-{sport}-{uuid.uuid4().hex[:8]}"):
+        # The queue already decided this listing is due, so skip the planner's min-interval reuse
+        matches = await crawl(user_agent=get_random_user_agent(), sports=[sport],
+                              start_date=day, end_date=day, force=True)
+        store_matches(matches, sports=[sport], dates=[day] if day else None)
+        logger.info(f"[SCHEDULER] {sport} {day or 'season'}: {len(matches)} matches refreshed")
+    return matches
+
+
+scheduler = ScrapeScheduler(refresh_listing)
+
+# Seconds between each worker's check of the shared scheduler switch
+SCHEDULER_POLL_INTERVAL = 2.0
+# A leader status older than this was left by a worker that died
+SCHEDULER_STATUS_MAX_AGE = 3 * SCHEDULER_POLL_INTERVAL
+# How long /schedule/start and /schedule/stop wait for the leader to confirm
+SCHEDULER_CONFIRM_TIMEOUT = 10.0
+
+
+def scheduler_enabled() -> bool:
+    return bool(result_store.get_state("scheduler", {}).get("enabled"))
+
+
+def report_scheduler():
+    result_store.set_state("scheduler_status", {**scheduler.status(), "pid": os.getpid(),
+                                                "reported_at": time.time()})
+
+
+async def reconcile_scheduler():
+    """Match this worker's scheduler to the shared switch; only the worker holding the leader lock runs it."""
+    if scheduler_enabled():
+        if not scheduler.is_running and result_store.claim_leader():
+            scheduler.start()
+    elif result_store.is_leader:
+        await scheduler.stop()
+        report_scheduler()
+        result_store.release_leader()
+    if result_store.is_leader:
+        report_scheduler()
+
+
+def shared_schedule() -> dict:
+    """The scheduler as its leader last reported it, whichever worker answers."""
+    status = result_store.get_state("scheduler_status") or scheduler.status()
+    if status["running"] and time.time() - status.get("reported_at", 0) > SCHEDULER_STATUS_MAX_AGE:
+        # Its worker died; another one picks the switch up on its next check
+        status = {**status, "running": False}
+    return {**status, "enabled": scheduler_enabled(), "leader": result_store.is_leader}
+
+
+async def switch_scheduler(enabled: bool) -> JSONResponse:
+    """Flip the shared switch and wait for the leader to follow: 200 once it has, 202 if still pending."""
+    result_store.set_state("scheduler", {"enabled": enabled})
+    await reconcile_scheduler()
+    deadline = time.monotonic() + SCHEDULER_CONFIRM_TIMEOUT
+    status = shared_schedule()
+    while status["running"] != enabled and time.monotonic() < deadline:
+        await asyncio.sleep(SCHEDULER_POLL_INTERVAL / 4)
+        status = shared_schedule()
+    return JSONResponse(content=status, status_code=200 if status["running"] == enabled else 202)
+
+
+async def watch_scheduler():
+    while True:
+        try:
+            await reconcile_scheduler()
+        except Exception as e:
+            logger.warning(f"[SCHEDULER] Could not sync with the shared switch: {e}")
+        await asyncio.sleep(SCHEDULER_POLL_INTERVAL)
+
+
+async def watch_results():
+    """Keep this worker's generation current while websocket clients wait for deltas."""
+    while True:
+        await asyncio.sleep(STREAM_POLL_INTERVAL)
+        if odds_broadcaster.subscribers:
+            try:
+                sync_results()
+            except Exception as e:
+                logger.warning(f"[STREAM] Result store poll failed: {e}")
+
+
+results_watcher = None
+scheduler_watcher = None
+warmup_task = None
+
+
+@app.on_event("startup")
+async def start_scheduler():
+    global results_watcher, scheduler_watcher, warmup_task
+    sync_results(force=True)
+    results_watcher = asyncio.create_task(watch_results())
+    warmup_task = asyncio.create_task(warmup.run())
+    # The switch lives in the store, so /schedule/start|stop reach whichever worker leads;
+    # SCHEDULER_ENABLED only sets it when nobody has yet
+    if os.getenv("SCHEDULER_ENABLED", "0") == "1":
+        result_store.set_state("scheduler", {"enabled": True}, only_if_missing=True)
+    scheduler_watcher = asyncio.create_task(watch_scheduler())
+
+
+@app.on_event("shutdown")
+async def stop_scheduler():
+    for task in (results_watcher, scheduler_watcher, warmup_task):
+        if task:
+            task.cancel()
+    await scheduler.stop()
+    if result_store.is_leader:
+        report_scheduler()
+        result_store.release_leader()
 
 
+@app.get("/health")
+async def health_check():
+    """Check if the API is running."""
+    return {"status": "API is running", "pid": os.getpid(), "generation": scraped_generation}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Whether this worker can scrape yet; 503 while the scraper is loading or if it failed to."""
+    return JSONResponse(content=warmup.status(), status_code=200 if warmup.ready else 503)
 
 
 @app.post("/scrape")
-async def scrape_matches():
-    """Trigger the scraping process for all sports."""
-    global scraped_data
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+async def scrape_matches(start_date: date | None = None, end_date: date | None = None,
+                         sports: str | None = None):
+    """Trigger the scraping process for a date window (default tomorrow) and sports (default all)."""
     try:
         logger.info("[*] Starting API scrape request...")
 
-
-
-
         user_agent = get_random_user_agent()
         logger.info(f"[*] Using UA: {user_agent}")
 
         # Run the existing fetch_matches function
-        matches = await fetch_matches(user_agent=user_agent)
-
-        # Store results
-        scraped_data = matches
+        sport_list = [s.strip().lower() for s in sports.split(",") if s.strip()] if sports else None
+        try:
+            with log_context(job=f"scrape-{uuid.uuid4().hex[:8]}"):
+                matches = await crawl(user_agent=user_agent, start_date=start_date,
+                                      end_date=end_date, sports=sport_list)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # Store results, keeping sports and dates this scrape didn't cover
+        store_matches(matches, sports=sport_list,
+                      dates=crawl_dates(start_date, end_date) if sport_list else None)
         logger.info(f"[+] Scraped {len(matches)} matches")
 
-
-
-
         # Prepare response
         response = {
             "status": "success",
             "message": f"Scraped {len(matches)} matches",
             "matches": matches,
+            "generation": scraped_generation,
             "timestamp": datetime.now().isoformat()
         }
-        return JSONResponse(content=response)
+        return JSONResponse(content=response, headers={"ETag": etag_for()})
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[!] Scrape error: {str(e)}")
 
-
         raise HTTPException(
             status_code=500, detail=f"Scraping failed: {str(e)}")
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: stage durations, rows/sec, failures, browser launches and market cache use."""
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/proxies")
+async def get_proxies():
+    """Health, latency and circuit state of each proxy in the pool, as the latest crawl in any worker left it."""
+    manager = active_proxy_manager()
+    if manager is None:
+        return {"enabled": False, "proxies": {}}
+    shared = result_store.get_state("proxies")
+    if shared is None:
+        return {"enabled": True, "proxies": manager.snapshot(), "pid": os.getpid()}
+    return {"enabled": True, **shared}
+
+
+@app.get("/schedule")
+async def get_schedule():
+    """Show the background refresh cadence and last run per listing, from the leading worker."""
+    return shared_schedule()
+
+
+@app.get("/schedule/queue")
+async def get_refresh_queue():
+    """Refresh queue depth, lag and per-task priority inputs, from the leading worker."""
+    return shared_schedule()["queue"]
+
+
+@app.post("/schedule/start")
+async def start_schedule():
+    """Start background refreshes so /matches always serves precomputed results; 202 until a worker has."""
+    return await switch_scheduler(True)
+
+
+@app.post("/schedule/stop")
+async def stop_schedule():
+    """Stop background refreshes; 202 until the leading worker has."""
+    return await switch_scheduler(False)
+
+
 @app.get("/matches")
-async def get_matches():
-    """Retrieve the most recently scraped matches."""
-    global scraped_data
+async def get_matches(request: Request, start: datetime | None = None, end: datetime | None = None):
+    """Retrieve the most recently scraped matches, optionally only those kicking off in [start, end)."""
+    sync_results()
     if not scraped_data:
         raise HTTPException(
             status_code=404, detail="No scraped data available")
 
+    etag = etag_for(f"{start.isoformat() if start else ''}_{end.isoformat() if end else ''}"
+                    if start or end else "")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    matches = matches_between(start, end)
     return JSONResponse(content={
         "status": "success",
-        "matches": scraped_data,
-        "count": len(scraped_data),
+        "matches": matches,
+        "count": len(matches),
+        "generation": scraped_generation,
         "timestamp": datetime.now().isoformat()
-    })
+    }, headers={"ETag": etag})
 
 
 @app.get("/matches/{sport}")
-async def get_matches_by_sport(sport: str):
+async def get_matches_by_sport(sport: str, request: Request):
     """Retrieve scraped matches for a specific sport."""
-    global scraped_data
+    sync_results()
     if not scraped_data:
         raise HTTPException(
             status_code=404, detail="No scraped data available")
 
-    # Filter matches by sport (case-insensitive)
-    filtered_matches = [match for match in scraped_data if match.get(
-        "league", "").lower() == sport.lower()]
+    etag = etag_for(sport.lower())
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    # Filter matches by league or sport (case-insensitive), both set at ingest
+    sport_key = sport.lower()
+    filtered_matches = [match for match in scraped_data if sport_key in (
+        match.get("league", "").lower(), match.get("sport", "").lower())]
 
     if not filtered_matches:
         raise HTTPException(
@@ -174,7 +407,47 @@ async def get_matches_by_sport(sport: str):
         "matches": filtered_matches,
         "count": len(filtered_matches),
         "timestamp": datetime.now().isoformat()
-    })
+    }, headers={"ETag": etag})
+
+
+@app.websocket("/ws/odds")
+async def odds_updates(websocket: WebSocket, sports: str | None = None, generation: int | None = None):
+    """Push odds deltas as new scrapes land.
+
+    `sports` is a comma-separated filter of planner sport keys ("football,nfl");
+    `generation` is the one the client already holds, to replay what it missed.
+    Clients may send {"sports": [...]} to change the filter. A "reset" message
+    means the client should refetch /matches.
+    """
+    await websocket.accept()
+    sync_results()
+    sport_list = [s.strip().lower() for s in sports.split(",") if s.strip()] if sports else None
+    subscriber = odds_broadcaster.subscribe(sport_list, since=generation, current=scraped_generation)
+
+    async def receive_filters():
+        try:
+            while True:
+                message = await websocket.receive_json()
+                if isinstance(message, dict) and "sports" in message:
+                    subscriber.sports = {s.lower() for s in message["sports"] or []} or None
+        except WebSocketDisconnect:
+            return
+
+    receiver = asyncio.create_task(receive_filters())
+    try:
+        while True:
+            outgoing = asyncio.create_task(subscriber.queue.get())
+            await asyncio.wait({outgoing, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if not outgoing.done():
+                # The receiver finished first: the client went away
+                outgoing.cancel()
+                break
+            await websocket.send_json(outgoing.result())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        odds_broadcaster.unsubscribe(subscriber)
 
 
 if __name__ == "__main__":
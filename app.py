@@ -15,6 +15,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from utils.user_agent_pool import get_random_user_agent
+    from utils.api_client import ApiClient, DEFAULT_TIMEOUT, apply_odds_delta
     from core.utils import get_logger
 except ImportError as e:
     st.error(f"Error importing modules: {e}")
@@ -25,46 +26,20 @@ API_URL = "https://oddsportalui.onrender.com/"  # Update this if the API runs el
 logger = get_logger()
 
 
-def map_url_to_league(match):
-    """Map match_url to the correct league name if league is 'Unknown'."""
-    url = match.get('match_url', '').lower()
-    league = match.get('league', 'Unknown')
-
-    # If league is already set correctly (e.g., NFL, NCAA, WNBA), keep it
-    if league in ["NFL", "NCAA", "WNBA"]:
-        return league
-
-    # Map based on URL patterns
-    if 'football' in url:
-        return "Football"
-    elif 'basketball' in url:
-        return "Basketball"
-    elif 'tennis' in url:
-        return "Tennis"
-    elif 'futsal' in url:
-        return "Futsal"
-    elif 'baseball' in url:
-        return "Baseball"
-    else:
-        return league  # Fallback to original league if no match
+@st.cache_resource
+def get_api_client():
+    """One keep-alive client per Streamlit server, shared across reruns."""
+    return ApiClient(API_URL)
 
 
 def fetch_matches_from_api():
-    """Fetch matches from the API and correct league names."""
+    """Fetch matches from the API (leagues are normalized server-side)."""
     try:
-        response = requests.get(f"{API_URL}/matches")
-        response.raise_for_status()
-        data = response.json()
+        data = get_api_client().get_json("/matches")
         if data["status"] == "success":
-            # Correct league names for matches
-            corrected_matches = []
-            for match in data["matches"]:
-                corrected_match = match.copy()  # Create a copy to avoid modifying original
-                if corrected_match.get('league') == "Unknown":
-                    corrected_match['league'] = map_url_to_league(
-                        corrected_match)
-                corrected_matches.append(corrected_match)
-            return corrected_matches
+            # Where /ws/odds deltas pick up from
+            st.session_state.odds_generation = data.get("generation")
+            return data["matches"]
         else:
             raise Exception(data.get("detail", "Unknown error from API"))
     except Exception as e:
@@ -72,21 +47,12 @@ def fetch_matches_from_api():
 
 
 def trigger_scrape():
-    """Trigger a new scrape via the API and correct league names."""
+    """Trigger a new scrape via the API."""
     try:
-        response = requests.post(f"{API_URL}/scrape")
-        response.raise_for_status()
-        data = response.json()
+        data = get_api_client().post_json("/scrape")
         if data["status"] == "success":
-            # Correct league names for matches
-            corrected_matches = []
-            for match in data["matches"]:
-                corrected_match = match.copy()
-                if corrected_match.get('league') == "Unknown":
-                    corrected_match['league'] = map_url_to_league(
-                        corrected_match)
-                corrected_matches.append(corrected_match)
-            return corrected_matches
+            st.session_state.odds_generation = data.get("generation")
+            return data["matches"]
         else:
             raise Exception(data.get("detail", "Unknown error from API"))
     except Exception as e:
@@ -267,6 +233,10 @@ if 'last_error' not in st.session_state:
     st.session_state.last_error = None
 if 'terminal_logs' not in st.session_state:
     st.session_state.terminal_logs = []
+if 'scheduler_enabled' not in st.session_state:
+    st.session_state.scheduler_enabled = False
+if 'odds_generation' not in st.session_state:
+    st.session_state.odds_generation = None
 
 # Navbar
 st.markdown("""
@@ -361,8 +331,7 @@ with col1:
                     log_display.code(
                         '\n'.join(st.session_state.terminal_logs[-10:]))
                     try:
-                        response = requests.get(f"{API_URL}/health")
-                        response.raise_for_status()
+                        get_api_client().get_json("/health", ttl=0)
                         progress_bar.progress(20)
                     except Exception as e:
                         raise Exception(f"API is not available: {str(e)}")
@@ -700,8 +669,7 @@ API URL: {API_URL}
 
         # Check API connectivity
         try:
-            response = requests.get(f"{API_URL}/health")
-            response.raise_for_status()
+            get_api_client().get_json("/health", ttl=0)
             dependency_checks.append(
                 ("✅ API Connectivity", "API is reachable"))
         except Exception as e:
@@ -730,10 +698,28 @@ with st.sidebar:
     st.markdown("## 🔧 Settings")
 
     # Auto-refresh option
-    auto_refresh = st.checkbox("Auto-refresh every 30 minutes")
+    auto_refresh = st.checkbox("Auto-refresh every 30 minutes",
+                               help="Runs the API's background scheduler and reloads its precomputed results.")
+
+    # Start/stop the server-side scheduler only when the checkbox flips
+    if auto_refresh != st.session_state.scheduler_enabled and not test_mode:
+        try:
+            action = "start" if auto_refresh else "stop"
+            get_api_client().post_json(f"/schedule/{action}", timeout=DEFAULT_TIMEOUT)
+            st.session_state.scheduler_enabled = auto_refresh
+        except Exception as e:
+            st.warning(f"Could not update the API scheduler: {str(e)}")
 
     if auto_refresh:
-        st.info("⏰ Auto-refresh enabled")
+        if test_mode:
+            st.info("⏰ Auto-refresh needs Test Mode off")
+        else:
+            try:
+                schedule = get_api_client().get_json("/schedule", ttl=30)
+                state = "running" if schedule["running"] else "stopped"
+                st.info(f"⏰ Server scheduler {state} for {len(schedule['listings'])} listings")
+            except Exception as e:
+                st.warning(f"Scheduler status unavailable: {str(e)}")
 
     st.markdown("---")
     st.markdown("## 📋 Quick Info")
@@ -769,8 +755,40 @@ with st.sidebar:
         st.success("Sample data generated!")
         st.rerun()
 
-# Auto-refresh logic
-if auto_refresh and st.session_state.last_scrape_time:
+def apply_odds_updates():
+    """Patch the cached table with the API's odds deltas; True if anything changed."""
+    changed = False
+    for message in get_api_client().odds_updates(st.session_state.odds_generation, wait=0.5):
+        if message["type"] == "delta" and message["base"] == st.session_state.odds_generation:
+            st.session_state.scraped_data = apply_odds_delta(st.session_state.scraped_data, message)
+            st.session_state.odds_generation = message["generation"]
+            changed = True
+        elif message["type"] in ("delta", "reset"):
+            # Missed a generation: start over from the full list, past the client's TTL cache
+            get_api_client().invalidate("/matches")
+            st.session_state.scraped_data = fetch_matches_from_api()
+            changed = True
+            break
+    return changed
+
+
+# Auto-refresh logic: apply pushed odds deltas when we have a base generation,
+# otherwise the API keeps results warm, so just reload them
+if auto_refresh and not test_mode and st.session_state.scraped_data and st.session_state.odds_generation is not None:
+    try:
+        odds_changed = apply_odds_updates()
+    except Exception as e:
+        odds_changed = False
+        st.session_state.last_error = f"Odds updates unavailable: {str(e)}"
+    if odds_changed:
+        st.session_state.last_scrape_time = datetime.now()
+        st.rerun()
+elif auto_refresh and not test_mode and st.session_state.last_scrape_time:
     time_diff = datetime.now() - st.session_state.last_scrape_time
     if time_diff.total_seconds() > 1800:  # 30 minutes
+        try:
+            st.session_state.scraped_data = fetch_matches_from_api()
+            st.session_state.last_scrape_time = datetime.now()
+        except Exception as e:
+            st.session_state.last_error = str(e)
         st.rerun()
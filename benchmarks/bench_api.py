@@ -0,0 +1,192 @@
+# benchmarks/bench_api.py
+#
+# In-process load test of the read endpoints.
+#
+#   python -m benchmarks.bench_api --matches 100000 --concurrency 16 --requests 50 --out api.json
+#
+# Seeds api.py's store with synthetic matches, then drives each scenario
+# through httpx's ASGI transport (no sockets, no uvicorn) with concurrent
+# clients and reports latency percentiles, throughput and memory as JSON.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+os.environ.setdefault("LOG_FORMAT", "text")
+# Keep the seeded snapshot out of ./output
+os.environ.setdefault("RESULTS_DB", os.path.join(tempfile.mkdtemp(prefix="bench_api_"), "results.sqlite"))
+
+import api  # noqa: E402
+from core.records import build_match  # noqa: E402
+
+# Same leagues and fixtures as app.py's generate_sample_data (app.py is a
+# Streamlit script, so it can't be imported here)
+SAMPLE_TEAMS = {
+    "NFL": [("Kansas City Chiefs", "Buffalo Bills"), ("Green Bay Packers", "Dallas Cowboys")],
+    "NBA": [("Los Angeles Lakers", "Boston Celtics"), ("Golden State Warriors", "Miami Heat")],
+    "WNBA": [("Las Vegas Aces", "New York Liberty"), ("Seattle Storm", "Phoenix Mercury")],
+    "NCAA": [("Duke Blue Devils", "North Carolina Tar Heels"), ("UCLA Bruins", "USC Trojans")],
+    "Tennis": [("Novak Djokovic", "Rafael Nadal"), ("Serena Williams", "Venus Williams")],
+    "Football": [("Manchester United", "Liverpool"), ("Barcelona", "Real Madrid")],
+    "Basketball": [("Team Phoenix", "Team Thunder"), ("Team Lightning", "Team Storm")],
+    "Baseball": [("New York Yankees", "Boston Red Sox"), ("Los Angeles Dodgers", "San Francisco Giants")],
+    "Futsal": [("Team Alpha", "Team Beta"), ("Team Gamma", "Team Delta")],
+}
+SAMPLE_PATHS = {
+    "NFL": "american-football/usa/nfl",
+    "NBA": "basketball/usa/nba",
+    "WNBA": "basketball/usa/wnba",
+    "NCAA": "american-football/usa/ncaa",
+    "Tennis": "tennis/spain/atp-madrid",
+    "Football": "football/england/premier-league",
+    "Basketball": "basketball/europe/euroleague",
+    "Baseball": "baseball/usa/mlb",
+    "Futsal": "futsal/spain/primera-division",
+}
+
+
+def generate_matches(count: int, seed=0) -> list[dict]:
+    """`count` matches shaped like generate_sample_data, spread over two weeks."""
+    rng = random.Random(seed)
+    leagues = list(SAMPLE_TEAMS)
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    matches = []
+    for i in range(count):
+        league = leagues[i % len(leagues)]
+        team1, team2 = SAMPLE_TEAMS[league][(i // len(leagues)) % 2]
+        kickoff = start + timedelta(minutes=rng.randrange(14 * 24 * 60))
+        slug = f"{team1}-{team2}".lower().replace(" ", "-")
+        url = f"https://www.oddsportal.com/{SAMPLE_PATHS[league]}/{slug}-m{i:07d}/"
+        outcomes = 3 if league in ("Football", "Futsal") else 2
+        odds = [f"{rng.uniform(1.05, 9.0):.2f}" for _ in range(outcomes)]
+        matches.append(build_match(team1, team2, odds, kickoff, url, league=league,
+                                   bookmakers=rng.randint(3, 30)))
+    return matches
+
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except OSError:
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 2**20 if sys.platform == "darwin" else 2**10
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def scenarios(matches: list[dict]) -> dict:
+    """name -> (path, params, headers)"""
+    window_start = datetime.fromisoformat(matches[len(matches) // 2]["datetime"])
+    return {
+        "matches_all": ("/matches", None, {}),
+        "matches_window_6h": ("/matches", {"start": window_start.isoformat(),
+                                           "end": (window_start + timedelta(hours=6)).isoformat()}, {}),
+        "matches_sport_football": ("/matches/football", None, {}),
+        "matches_sport_nfl": ("/matches/nfl", None, {}),
+        "matches_etag_304": ("/matches", None, {"If-None-Match": api.etag_for()}),
+    }
+
+
+async def run_scenario(client, path, params, headers, requests: int, concurrency: int) -> dict:
+    latencies = []
+    statuses = Counter()
+    sizes = []
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get(path, params=params, headers=headers)
+            await response.aread()
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+            sizes.append(int(response.headers.get("content-length") or len(response.content)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "throughput_rps": round(requests / elapsed, 1),
+        "wire_bytes": int(statistics.fmean(sizes)),
+        "statuses": dict(statuses),
+        "rss_mb": current_rss_mb(),
+    }
+
+
+async def run(args) -> dict:
+    rss_before = current_rss_mb()
+    started = time.perf_counter()
+    matches = generate_matches(args.matches)
+    api.store_matches(matches)
+    seed_seconds = time.perf_counter() - started
+    rss_seeded = current_rss_mb()
+    del matches
+
+    results = {}
+    transport = httpx.ASGITransport(app=api.app)
+    # Accept gzip like a browser or the Streamlit client would
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                 headers={"Accept-Encoding": "gzip"}, timeout=None) as client:
+        for name, (path, params, headers) in scenarios(api.scraped_data).items():
+            if args.only and name not in args.only:
+                continue
+            # One warm-up request so lazy imports and caches don't skew p99
+            await client.get(path, params=params, headers=headers)
+            results[name] = await run_scenario(client, path, params, headers,
+                                               args.requests, args.concurrency)
+
+    return {
+        "benchmark": "api",
+        "matches": args.matches,
+        "seed_seconds": round(seed_seconds, 3),
+        "rss_mb": {"before_seed": rss_before, "after_seed": rss_seeded, "peak": peak_rss_mb()},
+        "scenarios": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the FastAPI read endpoints in-process")
+    parser.add_argument("--matches", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=50, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--only", nargs="*", help="Run only these scenarios")
+    parser.add_argument("--out", help="Also write the results JSON here")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
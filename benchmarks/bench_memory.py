@@ -0,0 +1,163 @@
+# benchmarks/bench_memory.py
+#
+# Peak memory of a large crawl, collected versus streamed.
+#
+#   python -m benchmarks.bench_memory --listings 40 --rows 1000 5000 20000 --out memory.json
+#
+# No browser: each listing is a synthetic list of matches (10% repeated from
+# the previous listing, like a league page overlapping its sport page), so
+# only the pipeline after extraction is measured. "collect" gathers every
+# listing, dedupes and saves the list (fetch_matches + save_results);
+# "stream" runs the same listings through core.pipeline into the same CSV.
+# Each case runs in its own subprocess; peak traced allocations come from
+# tracemalloc, started after imports.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LEAGUES = [("football/england/premier-league", "Football", 3), ("basketball/usa/nba", "Basketball", 2),
+           ("american-football/usa/nfl", "NFL", 2), ("tennis/spain/atp-madrid", "Tennis", 2)]
+TEAMS = 5000
+
+
+def make_crawl(rows: int, overlap=0.1, seed=0):
+    """A stand-in for crawl_listing: listing n returns `rows` matches, some shared with listing n - 1."""
+    from core.records import build_match
+
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    async def crawl(n):
+        rng = random.Random(seed + n)
+        path, league, outcomes = LEAGUES[n % len(LEAGUES)]
+        shared = int(rows * overlap)
+        matches = []
+        for i in range(rows):
+            # The first `shared` rows reuse ids from the previous listing
+            match_id = (n - 1) * rows + rows - shared + i if i < shared and n else n * rows + i
+            url = f"https://www.oddsportal.com/{path}/team-a-team-b-m{match_id:08d}/"
+            odds = [f"{rng.uniform(1.05, 9.0):.2f}" for _ in range(outcomes)]
+            # Team names repeat across fixtures, as real ones do (see core.team_names)
+            matches.append(build_match(f"Team {match_id % TEAMS}A", f"Team {match_id % TEAMS}B", odds,
+                                       start + timedelta(minutes=match_id), url, league=league,
+                                       bookmakers=rng.randint(3, 30)))
+        await asyncio.sleep(0)
+        return matches
+
+    return crawl
+
+
+async def run_collect(listings, crawl, concurrency, output_path):
+    from core.crawl_planner import dedupe_matches
+    from core.main import save_results
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(n):
+        async with semaphore:
+            return await crawl(n)
+
+    results = await asyncio.gather(*[limited(n) for n in range(listings)])
+    matches = dedupe_matches([m for result in results for m in result])
+    save_results(matches, output_path)
+    return len(matches)
+
+
+async def run_stream(listings, crawl, concurrency, chunk_size, output_path):
+    from core.pipeline import (CONSOLIDATED_FIELDS, CsvWriter, dedupe_chunks, drain, flat_row,
+                               map_chunks, stream_listings)
+
+    chunks = stream_listings(range(listings), crawl, concurrency=concurrency, chunk_size=chunk_size)
+    with CsvWriter(output_path, CONSOLIDATED_FIELDS) as writer:
+        return await drain(map_chunks(dedupe_chunks(chunks), flat_row), writer)
+
+
+def run_case(args) -> dict:
+    os.environ.setdefault("LOG_FORMAT", "text")
+    # Import everything up front so tracemalloc only sees the data
+    import core.main  # noqa: F401
+    import core.pipeline  # noqa: F401
+
+    crawl = make_crawl(args.rows)
+    # The team index lives across crawls (and on disk); fill it first so only per-crawl data is traced
+    from core.records import build_match
+    for path, league, _ in LEAGUES:
+        for team in range(TEAMS):
+            build_match(f"Team {team}A", f"Team {team}B", [], None,
+                        f"https://www.oddsportal.com/{path}/team-a-team-b-m{team:08d}/", league=league)
+    output_path = os.path.join(tempfile.mkdtemp(prefix="bench_memory_"), "consolidated.csv")
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    if args.mode == "collect":
+        count = asyncio.run(run_collect(args.listings, crawl, args.concurrency, output_path))
+    else:
+        count = asyncio.run(run_stream(args.listings, crawl, args.concurrency, args.chunk_size, output_path))
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "mode": args.mode,
+        "listings": args.listings,
+        "rows_per_listing": args.rows,
+        "chunk_size": args.chunk_size if args.mode == "stream" else None,
+        "matches": count,
+        "csv_bytes": os.path.getsize(output_path),
+        "seconds": round(seconds, 3),
+        "peak_traced_mb": round(peak / 1024 / 1024, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of a collected versus streamed crawl")
+    parser.add_argument("--listings", type=int, default=40)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 20000],
+                        help="Matches per listing, one case per value")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument("--modes", nargs="+", choices=["collect", "stream"], default=["collect", "stream"])
+    parser.add_argument("--out", help="Also write the results JSON here")
+    parser.add_argument("--case", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", choices=["collect", "stream"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        args.rows = args.rows[0]
+        print(json.dumps(run_case(args)))
+        return
+
+    results = []
+    for rows in args.rows:
+        for mode in args.modes:
+            cmd = [sys.executable, "-m", "benchmarks.bench_memory", "--case", "--mode", mode,
+                   "--listings", str(args.listings), "--rows", str(rows),
+                   "--chunk-size", str(args.chunk_size), "--concurrency", str(args.concurrency)]
+            proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+            if proc.returncode != 0:
+                results.append({"mode": mode, "rows_per_listing": rows,
+                                "error": proc.stderr.strip().splitlines()[-1:]})
+                continue
+            results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    report = json.dumps({"benchmark": "memory", "cases": results}, indent=2)
+    print(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# benchmarks/bench_scrape.py
+#
+# Offline scrape benchmark against benchmarks/mock_oddsportal.py.
+#
+#   python -m benchmarks.bench_scrape --rows 100 1000 10000 --out bench.json
+#
+# Each listing size runs in its own subprocess so peak RSS and the counters
+# start from zero; the parent prints one JSON document with every case.
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def count_ipc_calls(counter: Counter):
+    """Count every Playwright protocol message; a no-op if the internals move."""
+    try:
+        from playwright._impl._connection import Connection
+    except ImportError:
+        return False
+
+    send = getattr(Connection, "_send_message_to_server", None)
+    if send is None:
+        return False
+
+    def counting_send(self, object, method, *args, **kwargs):
+        counter[method] += 1
+        return send(self, object, method, *args, **kwargs)
+
+    Connection._send_message_to_server = counting_send
+    return True
+
+
+def peak_rss_mb() -> dict:
+    # ru_maxrss is KiB on Linux; children only covers reaped processes (driver + browsers)
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    }
+
+
+def failure_count(registry) -> float:
+    """Sum of scraper_failures_total over every stage and sport."""
+    return sum(sample.value for metric in registry.collect() if metric.name == "scraper_failures"
+               for sample in metric.samples if sample.name == "scraper_failures_total")
+
+
+def run_case(args) -> dict:
+    """One benchmark case, in this process: serve the mock site and crawl it."""
+    from benchmarks.mock_oddsportal import MockSite, serve
+
+    site = MockSite(rows=args.rows, lazy_batch=args.lazy_batch, mode=args.mode)
+    server, base_url = serve(site)
+    # Must be set before core is imported; crawl_planner reads it at import time
+    os.environ["ODDSPORTAL_BASE_URL"] = base_url
+    os.environ.setdefault("LOG_FORMAT", "text")
+
+    from prometheus_client import REGISTRY
+    from core.fetch_matches import fetch_matches
+    from core.parse_odds import extract_markets
+    from core.retry import HostRateLimiter
+
+    ipc = Counter()
+    ipc_counted = count_ipc_calls(ipc)
+
+    # CrawlState and CSV/JSON output land in ./output, so keep them out of the repo
+    workdir = tempfile.mkdtemp(prefix="bench_scrape_")
+    os.chdir(workdir)
+
+    started = time.perf_counter()
+    matches = asyncio.run(fetch_matches(
+        sports=args.sports.split(","),
+        concurrency=args.concurrency,
+        rate_limiter=HostRateLimiter(0),
+    ))
+    listing_seconds = time.perf_counter() - started
+    listing_ipc = sum(ipc.values())
+
+    started = time.perf_counter()
+    markets = 0
+    for match in matches[:args.markets]:
+        market, _ = extract_markets(match["match_url"])
+        markets += market is not None
+    markets_seconds = time.perf_counter() - started
+
+    server.shutdown()
+    launches = REGISTRY.get_sample_value("scraper_browser_launches_total") or 0
+
+    # crawl_listing logs and swallows listing errors, so an empty or failing crawl must not pass as a result
+    failures = failure_count(REGISTRY)
+    if not matches or failures:
+        raise RuntimeError(f"Scraped {len(matches)} matches with {int(failures)} failures")
+
+    return {
+        "rows": args.rows,
+        "mode": args.mode,
+        "sports": args.sports,
+        "matches": len(matches),
+        "listing_seconds": round(listing_seconds, 3),
+        "rows_per_second": round(len(matches) / listing_seconds, 1) if listing_seconds else None,
+        "market_pages": min(args.markets, len(matches)),
+        "markets_found": markets,
+        "markets_seconds": round(markets_seconds, 3),
+        "browser_launches": int(launches),
+        "ipc_calls": {
+            "listing": listing_ipc if ipc_counted else None,
+            "total": sum(ipc.values()) if ipc_counted else None,
+            "top": ipc.most_common(5) if ipc_counted else None,
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against a local mock OddsPortal")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="Rows per listing page, one case per value")
+    parser.add_argument("--lazy-batch", type=int, default=500, help="Rows rendered per scroll")
+    parser.add_argument("--mode", choices=["dom", "feed"], default="dom",
+                        help="dom: rows only in the page; feed: rows also served as XHR JSON")
+    parser.add_argument("--sports", default="football")
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument("--markets", type=int, default=5, help="Match pages to open with extract_markets")
+    parser.add_argument("--out", help="Also write the results JSON here")
+    parser.add_argument("--case", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        args.rows = args.rows[0]
+        print(json.dumps(run_case(args)))
+        return
+
+    results = []
+    for rows in args.rows:
+        cmd = [sys.executable, "-m", "benchmarks.bench_scrape", "--case",
+               "--rows", str(rows), "--lazy-batch", str(args.lazy_batch), "--mode", args.mode,
+               "--sports", args.sports, "--concurrency", str(args.concurrency),
+               "--markets", str(args.markets)]
+        proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+        if proc.returncode != 0:
+            results.append({"rows": rows, "mode": args.mode, "error": proc.stderr.strip().splitlines()[-1:]})
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    report = json.dumps({"benchmark": "scrape", "cases": results}, indent=2)
+    print(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
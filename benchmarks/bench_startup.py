@@ -0,0 +1,136 @@
+# benchmarks/bench_startup.py
+#
+# API cold-start benchmark.
+#
+#   python -m benchmarks.bench_startup --runs 5 --out startup.json
+#
+# Each run measures, in fresh processes: how long `import api` takes, and how
+# long a uvicorn server takes from spawn to its first 200 on /health and to
+# /ready settling (200 once the scraper is loaded, or 503 "failed" where no
+# browser is installed). Reports the median of each plus the heavy modules api still imports.
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules whose import cost is worth watching; reported if api pulls them in
+WATCHED = ("pandas", "playwright.async_api", "core.fetch_matches", "core.sharded_crawl",
+           "fastapi", "prometheus_client")
+
+
+def bench_env() -> dict:
+    env = dict(os.environ, LOG_FORMAT="text", SCHEDULER_ENABLED="0")
+    env["RESULTS_DB"] = os.path.join(tempfile.mkdtemp(prefix="bench_startup_"), "results.sqlite")
+    return env
+
+
+def time_import() -> dict:
+    """Wall time of `import api` in a fresh interpreter, plus -X importtime for the watched modules."""
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import api"],
+                          cwd=ROOT, env=bench_env(), capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        if name in WATCHED:
+            modules[name] = round(int(cumulative) / 1e6, 3)
+    return {"wall": elapsed, "modules": modules}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def get(url):
+    """(status, JSON body) or (None, None) while the server isn't listening."""
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"null")
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        return None, None
+
+
+def time_server(timeout: float) -> dict:
+    """Seconds from spawning uvicorn to the first /health 200 and to /ready settling."""
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "api:app", "--port", str(port),
+                             "--log-level", "warning"],
+                            cwd=ROOT, env=bench_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    result = {"health": None, "ready": None, "ready_status": None}
+    try:
+        deadline = started + timeout
+        while time.perf_counter() < deadline and result["health"] is None:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {proc.returncode} before /health answered")
+            if get(f"{base}/health")[0] == 200:
+                result["health"] = time.perf_counter() - started
+            else:
+                time.sleep(0.005)
+        while time.perf_counter() < deadline and result["health"] is not None:
+            status, body = get(f"{base}/ready")
+            if status == 200 or (body or {}).get("stage") == "failed":
+                result["ready"] = time.perf_counter() - started
+                result["ready_status"] = body
+                break
+            time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return result
+
+
+def median(values):
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 3) if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API import and server start-up time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60, help="Per-run limit for the server to settle")
+    parser.add_argument("--out", help="Also write the results JSON here")
+    args = parser.parse_args()
+
+    imports = [time_import() for _ in range(args.runs)]
+    servers = [time_server(args.timeout) for _ in range(args.runs)]
+
+    report = json.dumps({
+        "benchmark": "startup",
+        "runs": args.runs,
+        "import_api_s": median([r["wall"] for r in imports]),
+        "imported_modules_s": {name: median([r["modules"].get(name) for r in imports])
+                               for name in WATCHED if any(name in r["modules"] for r in imports)},
+        "time_to_health_s": median([r["health"] for r in servers]),
+        "time_to_ready_s": median([r["ready"] for r in servers]),
+        "ready_status": servers[-1]["ready_status"],
+    }, indent=2)
+    print(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
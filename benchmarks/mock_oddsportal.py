@@ -0,0 +1,220 @@
+# benchmarks/mock_oddsportal.py
+
+import datetime
+import json
+import random
+import string
+import sys
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COUNTRIES = [
+    ("europe", "Europe", "euro-women", "Euro Women"),
+    ("england", "England", "premier-league", "Premier League"),
+    ("spain", "Spain", "laliga", "LaLiga"),
+    ("usa", "USA", "mls", "MLS"),
+    ("world", "World", "friendly-international", "Friendly International"),
+]
+
+THREE_WAY_SPORTS = {"football", "futsal", "hockey", "handball"}
+
+# Builds rows in batches as the page is scrolled to the bottom, like the
+# real listings do. In feed mode the rows come from a fetch() the scraper
+# can intercept instead of being inlined.
+LISTING_TEMPLATE = """<!DOCTYPE html>
+<html><head><title>Mock OddsPortal</title>
+<style>.eventRow {{ height: 48px; }}</style></head>
+<body><div id="rows"></div>
+<script>
+const LABELS = {labels};
+const BATCH = {batch};
+let ROWS = {rows};
+let next = 0;
+const container = document.getElementById('rows');
+function header(text) {{
+    return '<div data-testid="secondary-header"><div class="text-black-main">' + text + '</div>' +
+        LABELS.map(l => '<div class="flex-center">' + l + '</div>').join('') +
+        '<div class="flex-center">B\\'s</div></div>';
+}}
+function render() {{
+    const end = Math.min(next + BATCH, ROWS.length);
+    let html = '';
+    for (; next < end; next++) {{
+        const r = ROWS[next];
+        html += '<div class="eventRow">' + (r.h ? header(r.h) : '') +
+            '<div data-testid="game-row">' +
+            '<div data-testid="time-item"><p>' + r.t + '</p></div>' +
+            '<a href="' + r.u + '" title="' + r.a + '">' + r.a + '</a>' +
+            '<a href="' + r.u + '" title="' + r.b + '">' + r.b + '</a>' +
+            r.o.map(o => '<div><p data-testid="odd-container-default">' + o + '</p></div>').join('') +
+            '<div class="height-content">' + r.n + '</div>' +
+            '</div></div>';
+    }}
+    container.insertAdjacentHTML('beforeend', html);
+}}
+window.addEventListener('scroll', () => {{
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 100) render();
+}});
+{loader}
+</script></body></html>
+"""
+
+INLINE_LOADER = "render();"
+
+FEED_LOADER = """
+fetch('/ajax-nextgames' + location.pathname).then(r => r.json()).then(data => {
+    ROWS = data.d.rows.map(row => row._mock);
+    render();
+});
+"""
+
+MATCH_TEMPLATE = """<!DOCTYPE html>
+<html><head><title>{title}</title></head><body>
+<h1>{title}</h1>
+{tables}
+</body></html>
+"""
+
+MARKETS = ["1X2", "Draw No Bet", "Double Chance", "Asian Handicap"]
+
+
+class MockSite:
+    """Deterministic synthetic OddsPortal content, resizable between benchmark runs."""
+
+    def __init__(self, rows=1000, lazy_batch=500, market_rows=20, mode="dom", seed=0):
+        self.rows = rows
+        self.lazy_batch = lazy_batch
+        self.market_rows = market_rows
+        self.mode = mode
+        self.seed = seed
+
+    def configure(self, **settings):
+        for key, value in settings.items():
+            setattr(self, key, value)
+        self.listing_rows.cache_clear()
+
+    @lru_cache(maxsize=64)
+    def listing_rows(self, path: str) -> list[dict]:
+        segments = [s for s in path.split("/") if s]
+        if segments and segments[0] == "matches":
+            sport = segments[1] if len(segments) > 1 else "football"
+            date_str = segments[2] if len(segments) > 2 else None
+        else:
+            sport = segments[0] if segments else "football"
+            date_str = None
+
+        day = (datetime.datetime.strptime(date_str, "%Y%m%d").date() if date_str
+               else datetime.date.today() + datetime.timedelta(days=1))
+        rng = random.Random(f"{self.seed}:{path}:{self.rows}")
+        outcomes = 3 if sport in THREE_WAY_SPORTS else 2
+
+        rows = []
+        group = None
+        for i in range(self.rows):
+            # League pages span the season; daily pages stay on their date
+            if date_str is None:
+                day = day + datetime.timedelta(days=1 if i and i % 16 == 0 else 0)
+            country_slug, _, comp_slug, _ = COUNTRIES[(i // 8) % len(COUNTRIES)]
+            header = f"{day:%d %b %Y}"
+            opens_group = (header, comp_slug) != group
+            group = (header, comp_slug)
+
+            match_id = "".join(rng.choices(string.ascii_letters + string.digits, k=8))
+            home, away = f"Team {i * 2}", f"Team {i * 2 + 1}"
+            slug = f"team-{i * 2}-team-{i * 2 + 1}-{match_id}"
+            minute = (i * 5) % (24 * 60)
+            rows.append({
+                "h": header if opens_group else None,
+                "t": f"{minute // 60:02d}:{minute % 60:02d}",
+                "a": home,
+                "b": away,
+                "u": f"/{sport}/{country_slug}/{comp_slug}/{slug}/",
+                "o": [f"{rng.uniform(1.05, 12.0):.2f}" for _ in range(outcomes)],
+                "n": rng.randint(3, 30),
+                "ts": int(datetime.datetime(day.year, day.month, day.day, minute // 60, minute % 60,
+                                            tzinfo=datetime.timezone.utc).timestamp()),
+            })
+        return rows
+
+    def listing_html(self, path: str) -> str:
+        sport = [s for s in path.split("/") if s]
+        sport = sport[1] if sport and sport[0] == "matches" and len(sport) > 1 else (sport or ["football"])[0]
+        labels = ["1", "X", "2"] if sport in THREE_WAY_SPORTS else ["1", "2"]
+        inline = self.mode != "feed"
+        return LISTING_TEMPLATE.format(
+            labels=json.dumps(labels),
+            batch=self.lazy_batch,
+            rows=json.dumps(self.listing_rows(path)) if inline else "[]",
+            loader=INLINE_LOADER if inline else FEED_LOADER,
+        )
+
+    def feed_json(self, path: str) -> str:
+        rows = [{
+            "url": r["u"],
+            "home-name": r["a"],
+            "away-name": r["b"],
+            "date-start-timestamp": r["ts"],
+            "bookmakersCount": r["n"],
+            "odds": [{"avgOdds": float(o)} for o in r["o"]],
+            "_mock": r,
+        } for r in self.listing_rows(path)]
+        return json.dumps({"s": 1, "d": {"total": len(rows), "rows": rows}})
+
+    def match_html(self, path: str) -> str:
+        rng = random.Random(f"{self.seed}:{path}")
+        tables = []
+        for market in MARKETS:
+            rows = "".join(
+                f"<tr><td>Bookmaker {k}</td><td>{rng.uniform(1.05, 6):.2f}</td>"
+                f"<td>{rng.uniform(1.05, 6):.2f}</td><td>{rng.uniform(90, 99):.1f}%</td></tr>"
+                for k in range(self.market_rows)
+            )
+            tables.append(f'<div id="odds-data-table"><h2>{market}</h2><table>{rows}</table></div>')
+        return MATCH_TEMPLATE.format(title=path.strip("/").split("/")[-1], tables="\n".join(tables))
+
+    def route(self, path: str):
+        """Returns (status, content type, body) for a request path."""
+        path = path.split("?", 1)[0]
+        segments = [s for s in path.split("/") if s]
+        if path.startswith("/ajax-nextgames/"):
+            return 200, "application/json", self.feed_json(path[len("/ajax-nextgames"):])
+        if segments and (segments[0] == "matches" or len(segments) <= 3):
+            return 200, "text/html; charset=utf-8", self.listing_html(path)
+        if len(segments) == 4:
+            return 200, "text/html; charset=utf-8", self.match_html(path)
+        return 404, "text/plain", "not found"
+
+
+def make_handler(site: MockSite):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status, content_type, body = site.route(self.path)
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(site: MockSite, host="127.0.0.1", port=0):
+    """Start the mock site on a background thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    # Browse it by hand: python -m benchmarks.mock_oddsportal 8050 1000
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8050
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    server, base_url = serve(MockSite(rows=rows), port=port)
+    print(f"Mock OddsPortal on {base_url}/matches/football/{datetime.date.today():%Y%m%d}/")
+    threading.Event().wait()
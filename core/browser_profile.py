@@ -0,0 +1,262 @@
+# core/browser_profile.py
+
+import fcntl
+import itertools
+import json
+import os
+import time
+from typing import NamedTuple
+
+from core.metrics import PAGE_BYTES
+from core.utils import get_logger
+
+log = get_logger()
+
+PROFILE_DIR = os.getenv("BROWSER_PROFILE_DIR", os.path.join("./output", ".browser_profile"))
+# Set BROWSER_PROFILES=0 to go back to a fresh incognito context per scrape
+PROFILES_ENABLED = os.getenv("BROWSER_PROFILES", "1") == "1"
+# Chromium's disk cache bound per profile slot
+DISK_CACHE_BYTES = int(os.getenv("BROWSER_DISK_CACHE_BYTES", str(200 * 1024 * 1024)))
+
+# OddsPortal's OneTrust cookie banner
+CONSENT_SELECTOR = "#onetrust-accept-btn-handler"
+CONSENT_TIMEOUT = 3000
+
+
+class ProfileSlot(NamedTuple):
+    path: str
+    fd: int
+    cold: bool
+
+
+class PageLoad:
+    """Bytes one page pulled from the network versus Chromium's disk cache, from CDP Network events."""
+
+    def __init__(self):
+        self.requests = 0
+        self.cached_requests = 0
+        self.network_bytes = 0
+        self.cache_bytes = 0
+        self._cached = set()
+
+    async def attach(self, page):
+        cdp = await page.context.new_cdp_session(page)
+        cdp.on("Network.responseReceived", self._on_response)
+        cdp.on("Network.dataReceived", self._on_data)
+        cdp.on("Network.loadingFinished", self._on_finished)
+        await cdp.send("Network.enable")
+
+    def _on_response(self, params):
+        self.requests += 1
+        if params["response"].get("fromDiskCache"):
+            self.cached_requests += 1
+            self._cached.add(params["requestId"])
+
+    def _on_data(self, params):
+        if params["requestId"] in self._cached:
+            self.cache_bytes += params.get("dataLength", 0)
+
+    def _on_finished(self, params):
+        if params["requestId"] in self._cached:
+            self._cached.discard(params["requestId"])
+        else:
+            self.network_bytes += int(params.get("encodedDataLength", 0))
+
+
+async def accept_consent(page) -> bool:
+    """Click the cookie banner's accept button if it's showing; the cookie then rides along in storage_state."""
+    button = page.locator(CONSENT_SELECTOR)
+    if not await button.count():
+        return False
+    try:
+        await button.first.click(timeout=CONSENT_TIMEOUT)
+    except Exception as e:
+        log.warning(f"[PROFILE] Consent banner click failed: {e}")
+        return False
+    return True
+
+
+class BrowserProfiles:
+    """Persistent Chromium profiles for a crawl's browsers, one per concurrent launch.
+
+    Each launch locks a profile directory (slot-0, slot-1, ...), so its disk
+    cache survives across runs while concurrent browsers, in this process or
+    a sharded sibling, never share one. Cookies (the consent banner's among
+    them) are saved to one storage_state file after each scrape and added to
+    every launch, so a new slot starts past the banner too.
+    """
+
+    def __init__(self, directory=PROFILE_DIR):
+        self.directory = directory
+        self.state_path = os.path.join(directory, "storage_state.json")
+        self.baseline_path = os.path.join(directory, "load_baseline.json")
+        self.totals = {"loads": 0, "cold_loads": 0, "cold_seconds": 0.0, "warm_seconds": 0.0,
+                       "requests": 0, "cached_requests": 0, "network_bytes": 0, "cache_bytes": 0,
+                       "cold_network_bytes": 0, "consent_clicks": 0}
+
+    def claim(self) -> ProfileSlot:
+        """Lock the first free slot; the OS releases it if the process dies."""
+        os.makedirs(self.directory, exist_ok=True)
+        for n in itertools.count():
+            path = os.path.join(self.directory, f"slot-{n}")
+            fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                continue
+            return ProfileSlot(path, fd, cold=not os.path.isdir(path) or not os.listdir(path))
+
+    def release(self, slot: ProfileSlot):
+        os.close(slot.fd)
+
+    def saved_cookies(self) -> list[dict]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("cookies", [])
+        except (OSError, ValueError):
+            return []
+
+    async def save_state(self, context):
+        state = await context.storage_state()
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def record(self, cold: bool, seconds: float, load: PageLoad, consented: bool):
+        totals = self.totals
+        totals["loads"] += 1
+        totals["requests"] += load.requests
+        totals["cached_requests"] += load.cached_requests
+        totals["network_bytes"] += load.network_bytes
+        totals["cache_bytes"] += load.cache_bytes
+        totals["consent_clicks"] += consented
+        if cold:
+            totals["cold_loads"] += 1
+            totals["cold_seconds"] += seconds
+            totals["cold_network_bytes"] += load.network_bytes
+        else:
+            totals["warm_seconds"] += seconds
+        PAGE_BYTES.labels(source="network").inc(load.network_bytes)
+        PAGE_BYTES.labels(source="disk_cache").inc(load.cache_bytes)
+
+    def _update_baseline(self) -> dict:
+        """Fold this run's cold loads into the saved cold-profile averages and return them."""
+        try:
+            with open(self.baseline_path, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError):
+            baseline = {"loads": 0, "seconds": 0.0, "network_bytes": 0}
+
+        if self.totals["cold_loads"]:
+            baseline["loads"] += self.totals["cold_loads"]
+            baseline["seconds"] += self.totals["cold_seconds"]
+            baseline["network_bytes"] += self.totals["cold_network_bytes"]
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self.baseline_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(baseline, f)
+            os.replace(tmp_path, self.baseline_path)
+        return baseline
+
+    def report(self) -> dict:
+        """This run's page loads and what the warm profiles saved against a cold one."""
+        totals = self.totals
+        baseline = self._update_baseline()
+        warm_loads = totals["loads"] - totals["cold_loads"]
+
+        saved_seconds = None
+        if baseline["loads"] and warm_loads:
+            cold_average = baseline["seconds"] / baseline["loads"]
+            saved_seconds = round(warm_loads * cold_average - totals["warm_seconds"], 2)
+        return {
+            **totals,
+            "warm_loads": warm_loads,
+            "saved_seconds": saved_seconds,
+            "saved_bytes": totals["cache_bytes"],
+        }
+
+    def log_report(self):
+        report = self.report()
+        if not report["loads"]:
+            return
+        saved = f"~{report['saved_seconds']}s" if report["saved_seconds"] is not None else "n/a"
+        log.info(f"[PROFILE] {report['loads']} page loads ({report['cold_loads']} cold): "
+                 f"page-load time saved {saved}, {report['saved_bytes'] / 1e6:.1f} MB served from disk cache "
+                 f"({report['cached_requests']}/{report['requests']} requests), "
+                 f"{report['network_bytes'] / 1e6:.1f} MB from the network, "
+                 f"{report['consent_clicks']} consent banners accepted")
+
+
+class BrowserSession:
+    """One scrape's browser: a persistent profile slot with `profiles`, else a throwaway incognito context."""
+
+    def __init__(self, profiles: BrowserProfiles | None = None):
+        self.profiles = profiles
+        self.slot = None
+        self.browser = None
+        self.context = None
+        self.load = None
+        # Seconds the last goto took to respond
+        self.goto_seconds = None
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        try:
+            await self.close()
+        except Exception as e:
+            log.warning(f"[PROFILE] Browser shutdown failed: {e}")
+
+    async def start(self, pw, proxy=None, **options):
+        proxy = {"server": proxy} if proxy else None
+        if self.profiles is None:
+            self.browser = await pw.chromium.launch(headless=True)
+            self.context = await self.browser.new_context(proxy=proxy, **options)
+            return self.context
+
+        self.slot = self.profiles.claim()
+        self.context = await pw.chromium.launch_persistent_context(
+            self.slot.path, headless=True, proxy=proxy,
+            args=[f"--disk-cache-size={DISK_CACHE_BYTES}"], **options)
+        cookies = self.profiles.saved_cookies()
+        if cookies:
+            await self.context.add_cookies(cookies)
+        return self.context
+
+    async def new_page(self):
+        # A persistent context opens with a blank tab already
+        page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+        if self.profiles is not None:
+            self.load = PageLoad()
+            await self.load.attach(page)
+        return page
+
+    async def goto(self, page, url, **kwargs):
+        """page.goto, timed against the profile's cold baseline, then past any consent banner."""
+        started = time.perf_counter()
+        response = await page.goto(url, **kwargs)
+        seconds = self.goto_seconds = time.perf_counter() - started
+        if self.profiles is not None:
+            consented = await accept_consent(page)
+            self.profiles.record(self.slot.cold, seconds, self.load, consented)
+        return response
+
+    async def close(self):
+        """Save cookies, close the browser and unlock the slot; safe to call twice."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self.profiles is not None and self.context is not None:
+                await self.profiles.save_state(self.context)
+            if self.context is not None:
+                await self.context.close()
+            if self.browser is not None:
+                await self.browser.close()
+        finally:
+            if self.slot is not None:
+                self.profiles.release(self.slot)
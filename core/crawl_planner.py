@@ -0,0 +1,245 @@
+# core/crawl_planner.py
+
+import datetime
+import fcntl
+import hashlib
+import json
+import os
+import time
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+from core.url_parser import match_key  # noqa: F401 (re-exported)
+from core.utils import get_logger
+
+log = get_logger()
+
+# Overridable so benchmarks can point the crawler at a local mock site
+BASE_URL = os.getenv("ODDSPORTAL_BASE_URL", "https://www.oddsportal.com").rstrip("/")
+
+# Daily listing pages, one URL per sport per date
+DAILY_SPORTS = ["football", "basketball", "tennis", "futsal", "baseball"]
+
+# Season-long league pages: name -> (path, league label)
+LEAGUE_PAGES = {
+    "nfl": ("/american-football/usa/nfl/", "NFL"),
+    "ncaa": ("/american-football/usa/ncaa/", "NCAA"),
+    "wnba": ("/basketball/usa/wnba/", "WNBA"),
+}
+
+ALL_SPORTS = DAILY_SPORTS + list(LEAGUE_PAGES)
+
+# A listing whose last crawl found nothing new is not re-crawled for this long (seconds)
+DAILY_MIN_INTERVAL = 10 * 60
+LEAGUE_MIN_INTERVAL = 60 * 60
+
+# A matching fingerprint is trusted for this long (seconds) since the last
+# full parse; after that the listing is parsed anyway
+FINGERPRINT_MAX_AGE = 30 * 60
+
+STATE_DIR = os.path.join("./output", ".crawl_state")
+STATE_FILE = os.path.join(STATE_DIR, "listings.json")
+
+
+class ListingTask(NamedTuple):
+    key: str
+    label: str
+    url: str
+    output_subfolder: str
+    file_prefix: str
+    league: str | None
+    min_interval: int
+
+
+def crawl_dates(start_date=None, end_date=None) -> list[datetime.date]:
+    """The listing dates a crawl covers; defaults to tomorrow (UTC, like the listing pages)."""
+    if start_date is None:
+        start_date = datetime.datetime.utcnow().date() + datetime.timedelta(days=1)
+    if end_date is None:
+        end_date = start_date
+    if end_date < start_date:
+        raise ValueError("end_date must not be before start_date")
+    return [start_date + datetime.timedelta(days=n) for n in range((end_date - start_date).days + 1)]
+
+
+def plan_crawl(start_date=None, end_date=None, sports=None) -> list[ListingTask]:
+    """Expand a date range and sport set into listing tasks.
+
+    Defaults to tomorrow for every sport. League pages cover a whole season,
+    so they are planned once no matter how many dates are requested.
+    """
+    days = crawl_dates(start_date, end_date)
+
+    sports = [s.lower() for s in (sports or ALL_SPORTS)]
+    unknown = [s for s in sports if s not in ALL_SPORTS]
+    if unknown:
+        raise ValueError(f"Unknown sports: {', '.join(unknown)}")
+
+    tasks = []
+    for day in days:
+        date_str = day.strftime('%Y%m%d')
+        for sport in DAILY_SPORTS:
+            if sport in sports:
+                tasks.append(ListingTask(
+                    key=f"{sport}-{date_str}",
+                    label=f"{sport.upper()} {date_str}",
+                    url=f"{BASE_URL}/matches/{sport}/{date_str}/",
+                    output_subfolder=sport,
+                    file_prefix=f"{sport}_{date_str}",
+                    league=None,
+                    min_interval=DAILY_MIN_INTERVAL,
+                ))
+
+    for name, (path, league) in LEAGUE_PAGES.items():
+        if name in sports:
+            tasks.append(ListingTask(
+                key=name,
+                label=name.upper(),
+                url=f"{BASE_URL}{path}",
+                output_subfolder=name,
+                file_prefix=name,
+                league=league,
+                min_interval=LEAGUE_MIN_INTERVAL,
+            ))
+
+    return tasks
+
+
+def league_for_url(match_url: str) -> str | None:
+    """The league page label ("WNBA") of a match URL under one of LEAGUE_PAGES, else None."""
+    path = urlsplit(match_url or "").path
+    for page_path, league in LEAGUE_PAGES.values():
+        if path.startswith(page_path):
+            return league
+    return None
+
+
+def has_league_label(match: dict) -> bool:
+    return match.get("league", "").lower() in LEAGUE_PAGES
+
+
+def with_league_label(match: dict) -> dict:
+    """`match`, or a copy labelled with its league page when a daily listing left that off."""
+    if has_league_label(match):
+        return match
+    league = league_for_url(match.get("match_url"))
+    return {**match, "league": league} if league else match
+
+
+def dedupe_matches(matches: list[dict]) -> list[dict]:
+    """Drop matches seen on several listings, keeping the first occurrence.
+
+    The league page's label still wins, so a WNBA match keeps league "WNBA"
+    (and its sport key) even when the daily basketball listing finished first.
+    """
+    unique = {}
+    for match in matches:
+        key = match_key(match)
+        kept = unique.get(key)
+        if kept is None:
+            unique[key] = with_league_label(match)
+        elif has_league_label(match) and not has_league_label(kept):
+            unique[key] = {**kept, "league": match["league"]}
+    return list(unique.values())
+
+
+def sport_key(match: dict) -> str:
+    """Planner sport key a match belongs to ("nfl", "football", ...)."""
+    league = match.get("league", "").lower()
+    return league if league in LEAGUE_PAGES else match.get("sport", "").lower()
+
+
+def listing_digest(matches: list[dict]) -> str:
+    parts = sorted(f"{match_key(m)}:{','.join(m.get('odds', []))}" for m in matches)
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class CrawlState:
+    """Remembers what each listing returned last time so unchanged ones can be skipped."""
+
+    def __init__(self, path=STATE_FILE):
+        self.path = path
+        self.listings = self._load()
+        self._dirty = set()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            log.warning(f"[PLANNER] Ignoring unreadable crawl state: {e}")
+            return {}
+
+    def _snapshot_path(self, key):
+        return os.path.join(os.path.dirname(self.path), f"{key}.json")
+
+    def should_skip(self, task: ListingTask, now=None) -> bool:
+        entry = self.listings.get(task.key)
+        if not entry or not entry.get("unchanged"):
+            return False
+        now = time.time() if now is None else now
+        return now - entry.get("crawled_at", 0) < task.min_interval
+
+    def fingerprint(self, task: ListingTask, now=None):
+        """The listing's last fingerprint, or None once its full parse is too old to trust."""
+        entry = self.listings.get(task.key, {})
+        now = time.time() if now is None else now
+        if now - entry.get("parsed_at", 0) >= FINGERPRINT_MAX_AGE:
+            return None
+        return entry.get("fingerprint")
+
+    def previous_matches(self, task: ListingTask) -> list[dict]:
+        try:
+            with open(self._snapshot_path(task.key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return []
+
+    def record(self, task: ListingTask, matches: list[dict], fingerprint=None) -> bool:
+        """Store the listing result; returns True if it changed since the last crawl."""
+        digest = listing_digest(matches)
+        previous = self.listings.get(task.key, {})
+        changed = previous.get("digest") != digest
+        now = time.time()
+
+        self.listings[task.key] = {
+            "crawled_at": now,
+            "parsed_at": now,
+            "digest": digest,
+            "fingerprint": fingerprint,
+            "unchanged": not changed,
+            "count": len(matches),
+        }
+        self._dirty.add(task.key)
+        if changed:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self._snapshot_path(task.key), "w", encoding="utf-8") as f:
+                json.dump(matches, f)
+        return changed
+
+    def carry_forward(self, task: ListingTask) -> list[dict]:
+        """The page fingerprint matched: mark the listing crawled and reuse its last matches."""
+        entry = self.listings.get(task.key, {})
+        self.listings[task.key] = {**entry, "crawled_at": time.time(), "unchanged": True}
+        self._dirty.add(task.key)
+        return self.previous_matches(task)
+
+    def save(self):
+        """Write back the listings this crawl touched, keeping entries other crawls wrote meanwhile."""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Serialize the read-merge-write against other processes saving at once
+        with open(f"{self.path}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            listings = self._load()
+            listings.update({key: self.listings[key] for key in self._dirty})
+
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(listings, f, indent=2)
+            os.replace(tmp_path, self.path)
+        self.listings = listings
+        self._dirty.clear()
@@ -0,0 +1,205 @@
+# core/distributed.py
+#
+# Coordinator/worker mode over a shared LeaseStore:
+#
+#   python -m core.distributed worker --concurrency 2          (on every node)
+#   python -m core.distributed coordinator --sports football,nfl --markets
+#
+# Every node must see the same LEASE_DB file (e.g. a shared volume).
+
+import argparse
+import asyncio
+import datetime
+import os
+import socket
+import uuid
+
+from core.browser_profile import PROFILES_ENABLED, BrowserProfiles
+from core.crawl_planner import ListingTask, dedupe_matches, match_key, plan_crawl
+from core.fetch_matches import scrape_listing
+from core.lease_store import LeaseStore
+from core.parse_odds import extract_markets
+from core.retry import HostRateLimiter
+from core.team_names import save_team_index
+from core.utils import get_logger, log_context
+from utils.user_agent_pool import get_random_user_agent
+
+log = get_logger()
+
+LEASE_DB = os.getenv("LEASE_DB", "./output/leases.sqlite")
+# Seconds between claims when idle, and between coordinator progress checks
+POLL_INTERVAL = 2.0
+
+
+def plan_leases(start_date=None, end_date=None, sports=None, markets=False) -> list[tuple]:
+    """One lease per planned listing; with `markets` each listing queues its matches' detail pages."""
+    return [(task.key, "listing", {**task._asdict(), "markets": markets})
+            for task in plan_crawl(start_date, end_date, sports)]
+
+
+def market_leases(matches: list[dict]) -> list[tuple]:
+    return [(f"markets:{match_key(m)}", "markets",
+             {"match_url": m["match_url"], "kickoff": m.get("datetime")})
+            for m in matches if m.get("match_url")]
+
+
+def open_leases(progress: dict) -> int:
+    return sum(count for statuses in progress.values()
+               for status, count in statuses.items() if status in ("pending", "claimed"))
+
+
+async def coordinate(store: LeaseStore, start_date=None, end_date=None, sports=None, markets=False,
+                     crawl_id=None, poll=POLL_INTERVAL, timeout=None) -> list[dict]:
+    """Queue a crawl for the worker nodes and wait until every lease is done or failed.
+
+    Returns the deduped matches; with `markets`, each carries the odds
+    tables from its detail page under "markets".
+    """
+    crawl_id = crawl_id or f"crawl-{uuid.uuid4().hex[:8]}"
+    queued = store.submit(crawl_id, plan_leases(start_date, end_date, sports, markets))
+    log.info(f"[COORDINATOR] {crawl_id}: queued {queued} listings")
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout else None
+    while True:
+        progress = store.progress(crawl_id)
+        if not open_leases(progress):
+            break
+        if deadline and loop.time() > deadline:
+            log.warning(f"[COORDINATOR] {crawl_id}: timed out with {open_leases(progress)} leases open")
+            break
+        await asyncio.sleep(poll)
+
+    listings = store.results(crawl_id, "listing")
+    matches = dedupe_matches([m for result in listings.values() for m in result])
+    if markets:
+        details = store.results(crawl_id, "markets")
+        for match in matches:
+            detail = details.get(f"markets:{match_key(match)}")
+            if detail:
+                match["markets"] = detail
+
+    log.info(f"[COORDINATOR] {crawl_id}: {len(matches)} matches; progress {progress}")
+    return matches
+
+
+class LeaseWorker:
+    """Claims leases and runs them, `concurrency` at a time, heartbeating while they run."""
+
+    def __init__(self, store: LeaseStore, worker_id=None, concurrency=2, poll=POLL_INTERVAL,
+                 user_agent=None):
+        self.store = store
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.concurrency = concurrency
+        self.poll = poll
+        self.user_agent = user_agent
+        self.rate_limiter = HostRateLimiter()
+        self.profiles = BrowserProfiles() if PROFILES_ENABLED else None
+        self._held = {}  # (crawl_id, key) -> (lease, task)
+
+    async def run(self, exit_when_idle=False):
+        log.info(f"[WORKER] {self.worker_id} polling {self.store.path}")
+        heartbeat = asyncio.create_task(self._heartbeat())
+        running = set()
+        try:
+            while True:
+                free = self.concurrency - len(running)
+                leases = self.store.claim(self.worker_id, limit=free) if free else []
+                for lease in leases:
+                    task = asyncio.create_task(self._run_lease(lease))
+                    self._held[(lease.crawl_id, lease.key)] = (lease, task)
+                    running.add(task)
+
+                if running:
+                    _, running = await asyncio.wait(running, timeout=self.poll,
+                                                    return_when=asyncio.FIRST_COMPLETED)
+                elif exit_when_idle:
+                    break
+                else:
+                    await asyncio.sleep(self.poll)
+        finally:
+            heartbeat.cancel()
+            for task in running:
+                task.cancel()
+            if self.profiles:
+                self.profiles.log_report()
+            save_team_index()
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.store.lease_seconds / 3)
+            held = self.store.heartbeat(self.worker_id, [lease for lease, _ in self._held.values()])
+            for ident, (lease, task) in list(self._held.items()):
+                if ident not in held:
+                    # Expired and reassigned; another node owns it now
+                    log.warning(f"[WORKER] Lost lease {lease.key}; cancelling")
+                    task.cancel()
+
+    async def _run_lease(self, lease):
+        with log_context(worker=self.worker_id, crawl=lease.crawl_id, lease=lease.key):
+            try:
+                if lease.kind == "listing":
+                    result, follow_up = await self._scrape_listing(lease.payload)
+                else:
+                    result, follow_up = await self._scrape_markets(lease.payload), ()
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                log.error(f"[WORKER] {lease.key} failed (attempt {lease.attempts}): {e}")
+                self.store.fail(self.worker_id, lease, str(e))
+                return
+            finally:
+                self._held.pop((lease.crawl_id, lease.key), None)
+
+            self.store.complete(self.worker_id, lease, result, follow_up)
+
+    async def _scrape_listing(self, payload):
+        task = ListingTask(**{field: payload[field] for field in ListingTask._fields})
+        matches = await scrape_listing(task.label, task.url, task.output_subfolder, task.file_prefix,
+                                       league=task.league,
+                                       user_agent=self.user_agent or get_random_user_agent(),
+                                       rate_limiter=self.rate_limiter, profiles=self.profiles)
+        return matches, market_leases(matches) if payload.get("markets") else ()
+
+    async def _scrape_markets(self, payload):
+        # extract_markets uses the sync Playwright API, so it gets its own thread
+        market, odds = await asyncio.to_thread(extract_markets, payload["match_url"],
+                                               None, self.user_agent or get_random_user_agent(),
+                                               payload.get("kickoff") or None)
+        return {"market": market, "odds": odds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed OddsPortal crawl")
+    parser.add_argument("--db", default=LEASE_DB, help="Shared lease store (default $LEASE_DB)")
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    coordinator = modes.add_parser("coordinator", help="Queue a crawl and wait for the workers")
+    coordinator.add_argument("--sports", help="Comma-separated sports (default all)")
+    coordinator.add_argument("--start", type=datetime.date.fromisoformat)
+    coordinator.add_argument("--end", type=datetime.date.fromisoformat)
+    coordinator.add_argument("--markets", action="store_true", help="Also crawl each match's detail page")
+    coordinator.add_argument("--timeout", type=float)
+
+    worker = modes.add_parser("worker", help="Claim and run leases until stopped")
+    worker.add_argument("--id", dest="worker_id")
+    worker.add_argument("--concurrency", type=int, default=2)
+    worker.add_argument("--exit-when-idle", action="store_true")
+
+    args = parser.parse_args()
+    store = LeaseStore(args.db)
+
+    if args.mode == "worker":
+        asyncio.run(LeaseWorker(store, args.worker_id, args.concurrency).run(args.exit_when_idle))
+        return
+
+    from core.main import save_results
+
+    sports = [s.strip() for s in args.sports.split(",") if s.strip()] if args.sports else None
+    matches = asyncio.run(coordinate(store, args.start, args.end, sports, args.markets,
+                                     timeout=args.timeout))
+    save_results(matches)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# core/feed_capture.py
+
+import asyncio
+import datetime
+import hashlib
+import json
+import sys
+from urllib.parse import urljoin
+
+from core.crawl_planner import BASE_URL
+from core.records import build_match
+from core.utils import get_logger
+
+log = get_logger()
+
+# Background requests that carry listing data
+FEED_URL_MARKERS = ("/ajax-nextgames/", "/ajax-sport-country-tournament", "/feed/")
+
+
+def is_feed_url(url: str) -> bool:
+    return any(marker in url for marker in FEED_URL_MARKERS)
+
+
+def feed_rows(payload) -> list[dict]:
+    """Pull the event rows out of a feed payload ({"d": {"rows": [...]}} or {"rows": [...]})."""
+    if not isinstance(payload, dict):
+        return []
+    data = payload.get("d", payload)
+    rows = data.get("rows") if isinstance(data, dict) else None
+    return rows if isinstance(rows, list) else []
+
+
+def format_odd(value) -> str:
+    try:
+        return f"{float(value):.2f}"
+    except (TypeError, ValueError):
+        return str(value) if value is not None else ""
+
+
+def decode_feed(payload, league=None) -> list[dict]:
+    """Decode a feed payload straight into match records shaped like the DOM path's."""
+    matches = []
+    for row in feed_rows(payload):
+        try:
+            team1 = row.get("home-name")
+            team2 = row.get("away-name")
+            path = row.get("url")
+            if not (team1 and team2 and path):
+                continue
+
+            # No timestamp means no known kickoff, not "now"; the record's datetime is left empty
+            timestamp = row.get("date-start-timestamp")
+            match_datetime = None
+            if timestamp is not None:
+                match_datetime = datetime.datetime.fromtimestamp(
+                    int(timestamp), tz=datetime.timezone.utc)
+
+            odds = [format_odd(o.get("avgOdds")) for o in row.get("odds") or []
+                    if isinstance(o, dict)]
+
+            matches.append(build_match(
+                team1, team2, odds, match_datetime, urljoin(BASE_URL, path), league=league,
+                bookmakers=row.get("bookmakersCount")))
+        except Exception as e:
+            log.warning(f"[FEED] Skipping undecodable row: {e}")
+    return matches
+
+
+class FeedCapture:
+    """Records feed responses seen by a page via page.on("response")."""
+
+    def __init__(self, page):
+        self.payloads = []
+        self._pending = set()
+        page.on("response", self._on_response)
+
+    def _on_response(self, response):
+        if response.request.resource_type not in ("xhr", "fetch") or not is_feed_url(response.url):
+            return
+        task = asyncio.ensure_future(self._read(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _read(self, response):
+        try:
+            body = await response.body()
+            self.payloads.append(json.loads(body))
+        except Exception as e:
+            # Non-JSON (e.g. encrypted) feeds are left to the DOM fallback
+            log.debug(f"[FEED] Could not decode {response.url}: {e}")
+
+    async def drain(self):
+        """Wait for response bodies that are still being read."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def fingerprint(self) -> str | None:
+        """"rows:sha1" over every captured feed row, or None when there are none to go by.
+
+        It covers the whole feed rather than the rows rendered before lazy
+        scrolling, so odds moving anywhere on the listing change it.
+        """
+        rows = [row for payload in self.payloads for row in feed_rows(payload)]
+        if not rows:
+            return None
+        # Responses can land in any order
+        parts = sorted(json.dumps(row, sort_keys=True, ensure_ascii=False) for row in rows)
+        digest = hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+        return f"{len(rows)}:{digest}"
+
+    def matches(self, league=None) -> list[dict]:
+        matches = []
+        for payload in self.payloads:
+            matches.extend(decode_feed(payload, league=league))
+        return matches
+
+
+if __name__ == "__main__":
+    # Decode a recorded feed offline: python -m core.feed_capture format/feed_nextgames.json
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        decoded = decode_feed(json.load(f))
+    print(json.dumps(decoded, indent=4, ensure_ascii=False))
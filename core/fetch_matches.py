@@ -1,382 +1,308 @@
 import datetime
 import os
 import json
-import pandas as pd
-from core.utils import get_logger
-from playwright.async_api import async_playwright
+from core.utils import get_logger, log_context
+from core.url_parser import parse_match_url
+from core.records import build_match
+from core.match_time import BROWSER_TIMEZONE, parse_kickoffs
+from core.harvest import GAME_ROW_SELECTOR, harvest_rows
+from core.feed_capture import FeedCapture
+from core.browser_profile import PROFILES_ENABLED, BrowserProfiles, BrowserSession
+from core.crawl_planner import CrawlState, ListingTask, listing_digest, plan_crawl
+from core.team_names import save_team_index
+from core.pipeline import CHUNK_SIZE, dedupe_chunks, stream_listings, write_csv
+from utils.proxy_pool import ProxyBannedError
+from core.metrics import BROWSER_LAUNCHES, FAILURES, record_rows, stage_timer
+from core.retry import DEFAULT_RUN_BUDGET, HostRateLimiter, RetryBudget, with_retries
+from playwright.async_api import Error as PlaywrightError, async_playwright
 import asyncio
+import time
 
 log = get_logger()
 
+# Responses that mean the proxy has been blocked
+BAN_STATUSES = (403, 429)
 
-async def scrape_wnba(url: str, output_subfolder: str, user_agent=None) -> list[dict]:
-    matches = []
-
-    output_dir = os.path.join("./output", output_subfolder)
-    os.makedirs(output_dir, exist_ok=True)
-
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        context = await browser.new_context(user_agent=user_agent)
-        page = await context.new_page()
+# Failures worth another attempt (Playwright timeouts subclass PlaywrightError)
+RETRYABLE_ERRORS = (PlaywrightError, ProxyBannedError, asyncio.TimeoutError, OSError)
 
-        await page.goto(url, timeout=60000)
-        await page.wait_for_timeout(5000)
 
+async def harvest_dom_matches(page, label: str, url: str, now, league=None, sport="all") -> list[dict]:
+    """Fallback path: build matches from the rendered game-row elements."""
+    matches = []
 
-        await page.wait_for_selector('div[data-testid="game-row"]')
-
-        match_blocks = page.locator('div[data-testid="game-row"]')
-
-        count = await match_blocks.count()
-        log.info(f"[WNBA] Found {count} match rows")
-
-        now = datetime.datetime.utcnow()
-        formatted_date = now.strftime('%Y%m%d')
-
-        for i in range(count):
+    i = 0
+    header = None
+    columns = None
+    async for batch in harvest_rows(page, label, sport=sport):
+        # Rows inherit the last date header and column labels seen, including across batches
+        headers = []
+        row_columns = []
+        for row in batch:
+            header = row.get("header") or header
+            columns = row.get("columns") or columns
+            headers.append(header)
+            row_columns.append(columns)
+        with stage_timer("parse_kickoffs", sport):
+            kickoffs = parse_kickoffs(headers, [row.get("time") for row in batch], reference=now)
+
+        for row, kickoff, labels in zip(batch, kickoffs, row_columns):
             try:
-                block = match_blocks.nth(i)
-
-                team_links = block.locator("a[title]")
-                if await team_links.count() < 2:
+                titles = row["titles"]
+                if len(titles) < 2:
                     continue
 
-                team1 = await team_links.nth(0).get_attribute("title")
-                team2 = await team_links.nth(1).get_attribute("title")
+                team1, team2 = titles[0], titles[1]
 
-                odds_tags = block.locator(
-                    'p[data-testid="odd-container-default"]')
-                odds = []
-                for j in range(await odds_tags.count()):
-                    val = await odds_tags.nth(j).inner_text()
-                    odds.append(val.strip())
+                # The row links to its match page; fall back to the listing
+                match_url = next(
+                    (href for href in row["hrefs"] if parse_match_url(href).match_id), url)
 
-                match_datetime = now.replace(
-                    hour=0, minute=0, second=0) + datetime.timedelta(minutes=i * 5)
+                if kickoff is None:
+                    log.warning(f"[{label}] No kickoff for match {i} ({row.get('header')!r} {row.get('time')!r})")
 
-                matches.append({
-                    "datetime": match_datetime.isoformat(),
-                    "league": "WNBA",
-                    "team1": team1,
-                    "team2": team2,
-                    "odds": odds[:3],
-                    "match_url": url
-                })
+                matches.append(build_match(
+                    team1, team2, row["odds"], kickoff, match_url, league=league,
+                    bookmakers=row.get("bookmakers"), columns=labels))
 
             except Exception as e:
-                log.warning(f"[WNBA] Failed to parse match {i}: {e}")
-                continue
-
-        await context.close()
-        await browser.close()
-
-        if matches:
-            df = pd.DataFrame(matches)
-            csv_path = os.path.join(
-                output_dir, f"wnba_matches_{formatted_date}.csv")
-            json_path = os.path.join(
-                output_dir, f"wnba_matches_{formatted_date}.json")
-
-            df.to_csv(csv_path, index=False)
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(matches, f, indent=4)
-
-            log.info(f"[WNBA] Saved CSV to {csv_path}")
-            log.info(f"[WNBA] Saved JSON to {json_path}")
-        else:
-            log.warning(f"[WNBA] No matches scraped.")
+                log.warning(f"[{label}] Failed to parse match {i}: {e}")
+            finally:
+                i += 1
 
     return matches
 
 
-async def scrape_ncaa(url: str, output_subfolder: str, user_agent=None) -> list[dict]:
-    matches = []
-
-    output_dir = os.path.join("./output", output_subfolder)
-    os.makedirs(output_dir, exist_ok=True)
-
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        context = await browser.new_context(user_agent=user_agent)
-        page = await context.new_page()
+class ListingFingerprint:
+    """Carries a listing's last fingerprint into scrape_listing and the page's current one back out."""
 
-        await page.goto(url, timeout=60000)
-        await page.wait_for_timeout(5000)
+    def __init__(self, previous=None):
+        self.previous = previous
+        self.current = None
 
+    @property
+    def unchanged(self) -> bool:
+        return self.current is not None and self.current == self.previous
 
-        await page.wait_for_selector('div[data-testid="game-row"]')
 
-        match_blocks = page.locator('div[data-testid="game-row"]')
+async def scrape_listing(label: str, url: str, output_subfolder: str, file_prefix: str,
+                         league=None, user_agent=None, capture_feeds=True, proxy=None,
+                         rate_limiter=None, fingerprint=None, profiles=None, proxy_lease=None) -> list[dict]:
+    """Scrape one listing page and write its CSV/JSON.
 
-        count = await match_blocks.count()
-        log.info(f"[NCAA] Found {count} match rows")
+    With a `proxy_lease`, the navigation time is recorded on it as the proxy's latency.
 
-        now = datetime.datetime.utcnow()
-        formatted_date = now.strftime('%Y%m%d')
+    With `profiles` the browser runs in a persistent profile slot (disk cache
+    and cookies kept between scrapes) instead of a fresh incognito context.
 
-        for i in range(count):
-            try:
-                block = match_blocks.nth(i)
-
-                team_links = block.locator("a[title]")
-                if await team_links.count() < 2:
-                    continue
-
-                team1 = await team_links.nth(0).get_attribute("title")
-                team2 = await team_links.nth(1).get_attribute("title")
-
-                odds_tags = block.locator(
-                    'p[data-testid="odd-container-default"]')
-                odds = []
-                for j in range(await odds_tags.count()):
-                    val = await odds_tags.nth(j).inner_text()
-                    odds.append(val.strip())
-
-                match_datetime = now.replace(
-                    hour=0, minute=0, second=0) + datetime.timedelta(minutes=i * 5)
-
-                matches.append({
-                    "datetime": match_datetime.isoformat(),
-                    "league": "NCAA",
-                    "team1": team1,
-                    "team2": team2,
-                    "odds": odds[:3],
-                    "match_url": url
-                })
-
-            except Exception as e:
-                log.warning(f"[NCAA] Failed to parse match {i}: {e}")
-                continue
-
-        await context.close()
-        await browser.close()
-
-        if matches:
-            df = pd.DataFrame(matches)
-            csv_path = os.path.join(
-                output_dir, f"ncaa_matches_{formatted_date}.csv")
-            json_path = os.path.join(
-                output_dir, f"ncaa_matches_{formatted_date}.json")
-
-            df.to_csv(csv_path, index=False)
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(matches, f, indent=4)
-
-            log.info(f"[NCAA] Saved CSV to {csv_path}")
-            log.info(f"[NCAA] Saved JSON to {json_path}")
-        else:
-            log.warning(f"[NCAA] No matches scraped.")
-
-    return matches
-
-
-async def scrape_nfl(url: str, output_subfolder: str, user_agent=None) -> list[dict]:
+    With a `fingerprint` whose previous value still matches the captured
+    feed (or, without one, the harvested rows), nothing is written and []
+    is returned; the caller reuses its last result (see
+    `ListingFingerprint.unchanged`).
+    """
     matches = []
 
     output_dir = os.path.join("./output", output_subfolder)
     os.makedirs(output_dir, exist_ok=True)
 
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        context = await browser.new_context(user_agent=user_agent)
-        page = await context.new_page()
-
-        await page.goto(url, timeout=60000)
-        await page.wait_for_timeout(5000)
-
-
-        await page.wait_for_selector('div[data-testid="game-row"]')
-
-        match_blocks = page.locator('div[data-testid="game-row"]')
-
-        count = await match_blocks.count()
-        log.info(f"[NFL] Found {count} match rows")
-
-        now = datetime.datetime.utcnow()
+    # Metrics are labelled by sport folder, not by the per-date label
+    sport = output_subfolder
+    started = time.perf_counter()
+
+    async with async_playwright() as pw, BrowserSession(profiles) as session:
+        with stage_timer("browser_launch", sport):
+            await session.start(pw, proxy=proxy, user_agent=user_agent, timezone_id=BROWSER_TIMEZONE)
+            BROWSER_LAUNCHES.inc()
+            page = await session.new_page()
+
+        capture = FeedCapture(page) if capture_feeds else None
+
+        if rate_limiter:
+            with stage_timer("rate_limit_wait", sport):
+                await rate_limiter.wait(url)
+        with stage_timer("goto", sport):
+            response = await session.goto(page, url, timeout=60000)
+        if proxy_lease:
+            proxy_lease.latency = session.goto_seconds
+        if proxy and response and response.status in BAN_STATUSES:
+            raise ProxyBannedError(f"{proxy} got HTTP {response.status} for {url}")
+        with stage_timer("wait_rows", sport):
+            await page.wait_for_selector(GAME_ROW_SELECTOR)
+
+        now = datetime.datetime.now(datetime.timezone.utc)
         formatted_date = now.strftime('%Y%m%d')
 
-        for i in range(count):
-            try:
-                block = match_blocks.nth(i)
-
-                team_links = block.locator("a[title]")
-                if await team_links.count() < 2:
-                    continue
-
-                team1 = await team_links.nth(0).get_attribute("title")
-                team2 = await team_links.nth(1).get_attribute("title")
-
-                odds_tags = block.locator(
-                    'p[data-testid="odd-container-default"]')
-                odds = []
-                for j in range(await odds_tags.count()):
-                    val = await odds_tags.nth(j).inner_text()
-                    odds.append(val.strip())
+        # Prefer the decoded XHR feeds; the rendered rows are the fallback
+        unchanged = False
+        if capture:
+            with stage_timer("feed_decode", sport):
+                await capture.drain()
+                if fingerprint is not None:
+                    # The whole feed, known before any parsing
+                    fingerprint.current = capture.fingerprint()
+                    unchanged = fingerprint.unchanged
+                if not unchanged:
+                    matches = capture.matches(league=league)
+            if unchanged:
+                log.info(f"[{label}] Feed fingerprint unchanged; skipping parse and output")
+            elif matches:
+                log.info(f"[{label}] Decoded {len(matches)} matches from {len(capture.payloads)} feed responses")
+
+        if not matches and not unchanged:
+            with stage_timer("row_extraction", sport):
+                matches = await harvest_dom_matches(page, label, url, now, league=league, sport=sport)
+            if fingerprint is not None and matches:
+                # No usable feed: fingerprint the row ids and odds once the scroll harvest has them all,
+                # which still saves the output writes and the state update
+                fingerprint.current = f"dom:{len(matches)}:{listing_digest(matches)}"
+                unchanged = fingerprint.unchanged
+                if unchanged:
+                    log.info(f"[{label}] Row fingerprint unchanged; skipping output")
+                    matches = []
 
-                match_datetime = now.replace(
-                    hour=0, minute=0, second=0) + datetime.timedelta(minutes=i * 5)
-
-                matches.append({
-                    "datetime": match_datetime.isoformat(),
-                    "league": "NFL",
-                    "team1": team1,
-                    "team2": team2,
-                    "odds": odds[:3],
-                    "match_url": url
-                })
+        try:
+            with stage_timer("browser_close", sport):
+                await session.close()
+        except Exception as e:
+            # The rows are already in memory; a dying browser shouldn't cost them
+            log.warning(f"[{label}] Browser shutdown failed: {e}")
 
-            except Exception as e:
-                log.warning(f"[NFL] Failed to parse match {i}: {e}")
-                continue
+        if unchanged:
+            return matches
 
-        await context.close()
-        await browser.close()
+        record_rows(sport, len(matches), time.perf_counter() - started)
 
         if matches:
-            df = pd.DataFrame(matches)
-            csv_path = os.path.join(
-                output_dir, f"nfl_matches_{formatted_date}.csv")
-            json_path = os.path.join(
-                output_dir, f"nfl_matches_{formatted_date}.json")
-
-            df.to_csv(csv_path, index=False)
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(matches, f, indent=4)
-
-            log.info(f"[NFL] Saved CSV to {csv_path}")
-            log.info(f"[NFL] Saved JSON to {json_path}")
+            with stage_timer("write_output", sport):
+                csv_path = os.path.join(
+                    output_dir, f"{file_prefix}_matches_{formatted_date}.csv")
+                json_path = os.path.join(
+                    output_dir, f"{file_prefix}_matches_{formatted_date}.json")
+
+                write_csv(csv_path, matches)
+                with open(json_path, "w", encoding="utf-8") as f:
+                    json.dump(matches, f, indent=4)
+
+            log.info(f"[{label}] Saved CSV to {csv_path}")
+            log.info(f"[{label}] Saved JSON to {json_path}")
         else:
-            log.warning(f"[NFL] No matches scraped.")
+            log.warning(f"[{label}] No matches scraped.")
 
     return matches
 
 
-async def scrape_sport(sport: str, url: str, output_subfolder: str, user_agent=None) -> list[dict]:
-    matches = []
-
-    output_dir = os.path.join("./output", output_subfolder)
-    os.makedirs(output_dir, exist_ok=True)
-
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        context = await browser.new_context(user_agent=user_agent)
-        page = await context.new_page()
-
-        await page.goto(url, timeout=60000)
-        await page.wait_for_timeout(5000)
-
-
-        await page.wait_for_selector('div[data-testid="game-row"]')
-
-        match_blocks = page.locator('div[data-testid="game-row"]')
-
-        count = await match_blocks.count()
-        log.info(f"[{sport.upper()}] Found {count} match rows")
-
-        now = datetime.datetime.utcnow()
-        formatted_date = now.strftime('%Y%m%d')
-
-        for i in range(count):
-            try:
-                block = match_blocks.nth(i)
-
-                team_links = block.locator("a[title]")
-                if await team_links.count() < 2:
-                    continue
-
-                team1 = await team_links.nth(0).get_attribute("title")
-                team2 = await team_links.nth(1).get_attribute("title")
-
-                odds_tags = block.locator(
-                    'p[data-testid="odd-container-default"]')
-                odds = []
-                for j in range(await odds_tags.count()):
-                    val = await odds_tags.nth(j).inner_text()
-                    odds.append(val.strip())
-
-                match_datetime = now.replace(
-                    hour=0, minute=0, second=0) + datetime.timedelta(minutes=i * 5)
-
-                matches.append({
-                    "datetime": match_datetime.isoformat(),
-                    "league": "Unknown",
-                    "team1": team1,
-                    "team2": team2,
-                    "odds": odds[:3],
-                    "match_url": url
-                })
-
-            except Exception as e:
-                log.warning(
-                    f"[{sport.upper()}] Failed to parse match {i}: {e}")
-                continue
+async def scrape_wnba(url: str, output_subfolder: str, user_agent=None) -> list[dict]:
+    return await scrape_listing("WNBA", url, output_subfolder, "wnba", league="WNBA", user_agent=user_agent)
 
-        await context.close()
-        await browser.close()
 
-        if matches:
-            df = pd.DataFrame(matches)
-            csv_path = os.path.join(
-                output_dir, f"{sport}_matches_{formatted_date}.csv")
-            json_path = os.path.join(
-                output_dir, f"{sport}_matches_{formatted_date}.json")
-
-            df.to_csv(csv_path, index=False)
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(matches, f, indent=4)
-
-            log.info(f"[{sport.upper()}] Saved CSV to {csv_path}")
-            log.info(f"[{sport.upper()}] Saved JSON to {json_path}")
-        else:
-            log.warning(f"[{sport.upper()}] No matches scraped.")
-
-    return matches
+async def scrape_ncaa(url: str, output_subfolder: str, user_agent=None) -> list[dict]:
+    return await scrape_listing("NCAA", url, output_subfolder, "ncaa", league="NCAA", user_agent=user_agent)
 
 
-async def fetch_matches(proxy=None, user_agent=None) -> list[dict]:
-    tomorrow = datetime.datetime.utcnow().date() + datetime.timedelta(days=1)
-    date_str = tomorrow.strftime('%Y%m%d')
-
-    football_url = f"https://www.oddsportal.com/matches/football/{date_str}/"
-    basketball_url = f"https://www.oddsportal.com/matches/basketball/{date_str}/"
-    tennis_url = f"https://www.oddsportal.com/matches/tennis/{date_str}/"
-    futsal_url = f"https://www.oddsportal.com/matches/futsal/{date_str}/"
-    baseball_url = f"https://www.oddsportal.com/matches/baseball/{date_str}/"
-    nfl_url = "https://www.oddsportal.com/american-football/usa/nfl/"
-    ncaa_url = "https://www.oddsportal.com/american-football/usa/ncaa/"
-    wnba_url = "https://www.oddsportal.com/basketball/usa/wnba/"
-
-    all_matches = []
-
-    # FOR scrape_sport: provide 3 args: sport, url, output_subfolder
-    for sport, url in [
-        ("football", football_url),
-        ("basketball", basketball_url),
-        ("tennis", tennis_url),
-        ("futsal", futsal_url),
-        ("baseball", baseball_url),
-    ]:
-        try:
+async def scrape_nfl(url: str, output_subfolder: str, user_agent=None) -> list[dict]:
+    return await scrape_listing("NFL", url, output_subfolder, "nfl", league="NFL", user_agent=user_agent)
 
-            result = await scrape_sport(sport, url, sport, user_agent=user_agent)
-            all_matches.extend(result)
 
-        except Exception as e:
-            log.error(f"[{sport.upper()}] Error during scraping: {e}")
-
-    # For unique scrapers (nfl, ncaa, wnba)
-    for name, url, folder, func in [
-        ("nfl", nfl_url, "nfl", scrape_nfl),
-        ("ncaa", ncaa_url, "ncaa", scrape_ncaa),
-        ("wnba", wnba_url, "wnba", scrape_wnba),
-    ]:
+async def scrape_sport(sport: str, url: str, output_subfolder: str, user_agent=None) -> list[dict]:
+    return await scrape_listing(sport.upper(), url, output_subfolder, sport, user_agent=user_agent)
+
+
+async def crawl_listing(task: ListingTask, state: CrawlState, semaphore: asyncio.Semaphore,
+                        user_agent=None, proxy=None, proxy_manager=None, budget=None,
+                        rate_limiter=None, profiles=None, force=False) -> list[dict]:
+    # `force` re-crawls a listing even within its min_interval (the scheduler paces its own)
+    if not force and state.should_skip(task):
+        log.info(f"[{task.label}] Unchanged since last crawl, reusing previous results")
+        return state.previous_matches(task)
+
+    # Lets the page skip parsing when its rows hash the same as last time
+    fingerprint = ListingFingerprint(state.fingerprint(task))
+
+    async def attempt():
+        kwargs = dict(league=task.league, user_agent=user_agent, rate_limiter=rate_limiter,
+                      fingerprint=fingerprint, profiles=profiles)
+        if proxy_manager and not proxy:
+            # One proxy per browser context (a fresh one per retry), scored by how this listing went
+            async with proxy_manager.lease() as leased:
+                return await scrape_listing(task.label, task.url, task.output_subfolder, task.file_prefix,
+                                            proxy=leased.proxy, proxy_lease=leased, **kwargs)
+        return await scrape_listing(task.label, task.url, task.output_subfolder, task.file_prefix,
+                                    proxy=proxy, **kwargs)
+
+    async with semaphore:
         try:
-
-            result = await func(url, folder, user_agent=user_agent)
-            all_matches.extend(result)
-
+            with log_context(sport=task.output_subfolder, listing=task.key):
+                result = await with_retries(attempt, task.label, budget=budget, retry_on=RETRYABLE_ERRORS)
         except Exception as e:
-            log.error(f"[{name.upper()}] Error during scraping: {e}")
-
-    return all_matches
+            FAILURES.labels(stage="listing", sport=task.output_subfolder).inc()
+            log.error(f"[{task.label}] Error during scraping: {e}")
+            return state.previous_matches(task)
+
+    if fingerprint.unchanged:
+        log.info(f"[{task.label}] Carrying forward {state.listings[task.key].get('count', 0)} unchanged matches")
+        return state.carry_forward(task)
+    if result:
+        state.record(task, result, fingerprint=fingerprint.current)
+    return result
+
+
+async def iter_matches(proxy=None, user_agent=None, start_date=None, end_date=None,
+                       sports=None, concurrency=3, proxy_manager=None,
+                       retry_budget=DEFAULT_RUN_BUDGET, rate_limiter=None, chunk_size=CHUNK_SIZE,
+                       force=False):
+    """fetch_matches as a stream: deduped chunks of up to `chunk_size` matches as listings finish.
+
+    Listings are crawled `concurrency` at a time and a slow consumer holds the
+    crawlers back, so memory doesn't grow with the size of the crawl.
+    """
+    tasks = plan_crawl(start_date, end_date, sports)
+    state = CrawlState()
+    semaphore = asyncio.Semaphore(concurrency)
+    budget = RetryBudget(retry_budget)
+    rate_limiter = rate_limiter or HostRateLimiter()
+    profiles = BrowserProfiles() if PROFILES_ENABLED else None
+    rows = unique = 0
+
+    async def crawl(task):
+        nonlocal rows
+        matches = await crawl_listing(task, state, semaphore, user_agent=user_agent, proxy=proxy,
+                                      proxy_manager=proxy_manager, budget=budget,
+                                      rate_limiter=rate_limiter, profiles=profiles, force=force)
+        rows += len(matches)
+        return matches
+
+    log.info(f"[*] Planned {len(tasks)} listings (concurrency {concurrency})")
+    listings = stream_listings(tasks, crawl, concurrency=concurrency, chunk_size=chunk_size)
+    try:
+        with stage_timer("fetch_matches"):
+            async for chunk in dedupe_chunks(listings):
+                unique += len(chunk)
+                yield chunk
+    finally:
+        # Stops the crawlers now if the consumer gave up early
+        await listings.aclose()
+        state.save()
+        save_team_index()
+        if profiles:
+            profiles.log_report()
+        if budget.used:
+            log.info(f"[*] Used {budget.used}/{budget.total} retries")
+        log.info(f"[*] {unique} unique matches from {rows} rows")
+
+
+async def fetch_matches(proxy=None, user_agent=None, start_date=None, end_date=None,
+                        sports=None, concurrency=3, proxy_manager=None,
+                        retry_budget=DEFAULT_RUN_BUDGET, rate_limiter=None, force=False) -> list[dict]:
+    """Crawl every listing in the date window concurrently and dedupe by match id.
+
+    `proxy` pins every context to one proxy; otherwise `proxy_manager` leases
+    a health-weighted proxy per context; with neither, contexts go direct.
+    Failed listings are retried with backoff out of a `retry_budget` shared
+    by the whole run. `force` re-crawls listings the planner would reuse
+    as unchanged. Collects iter_matches into one list; stream that
+    instead when the crawl is too big to hold.
+    """
+    return [match async for chunk in iter_matches(proxy, user_agent, start_date, end_date, sports,
+                                                  concurrency, proxy_manager, retry_budget, rate_limiter,
+                                                  force=force)
+            for match in chunk]
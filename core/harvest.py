@@ -0,0 +1,99 @@
+# core/harvest.py
+
+from core.metrics import stage_timer
+from core.utils import get_logger
+
+log = get_logger()
+
+GAME_ROW_SELECTOR = 'div[data-testid="game-row"]'
+
+# Reads every row not yet harvested in a single evaluate and tags it, so the
+# next step only sees rows that lazy-loaded since. `header` is the date header
+# ("Tomorrow, 05 Jul") opening the row's event group, or null when the row
+# continues the previous group; `time` is the kickoff time shown in the row.
+# Every odds cell is returned along with the bookmaker count and, for rows
+# opening a group, the header's column labels.
+HARVEST_JS = """
+(selector) => {
+    const rows = document.querySelectorAll(selector + ':not([data-harvested])');
+    const out = [];
+    for (const row of rows) {
+        row.setAttribute('data-harvested', '1');
+        const group = row.closest('.eventRow') || row.parentElement;
+        const header = group && group.querySelector(
+            '[data-testid="date-header"], [data-testid="secondary-header"] .text-black-main, .text-black-main');
+        const timeEl = row.querySelector('[data-testid="time-item"] p, [data-testid="time-item"]');
+        let time = timeEl ? timeEl.innerText.trim() : null;
+        if (!time) {
+            const p = Array.from(row.querySelectorAll('p'), p => p.innerText.trim())
+                .find(text => /^\\d{1,2}:\\d{2}$/.test(text));
+            time = p || null;
+        }
+        const oddEls = Array.from(row.querySelectorAll('p[data-testid="odd-container-default"]'));
+        // Bookmaker count: the bare integer cell next to the odds ("B's" column)
+        const countEl = row.querySelector('[data-testid="bookmaker-count"]') ||
+            Array.from(row.querySelectorAll('.height-content, div, p'))
+                .filter(el => el.children.length === 0 && !oddEls.some(o => o.contains(el) || el.contains(o)))
+                .reverse().find(el => /^\\d+$/.test(el.innerText.trim()));
+        // Column labels ("1", "X", "2", "B's") from the group header, when this row opens a group
+        const labels = header && !row.contains(header)
+            ? Array.from(group.querySelectorAll('.flex-center'))
+                .filter(el => !row.contains(el))
+                .map(el => el.innerText.trim())
+                .filter(text => text && text.length <= 3)
+            : null;
+        out.push({
+            header: header && !row.contains(header) ? header.innerText.trim() : null,
+            columns: labels && labels.length ? labels : null,
+            time: time,
+            titles: Array.from(row.querySelectorAll('a[title]'), a => a.getAttribute('title')),
+            hrefs: Array.from(row.querySelectorAll('a[href]'), a => a.href),
+            odds: oddEls.map(p => p.innerText.trim()),
+            bookmakers: countEl ? parseInt(countEl.innerText.trim(), 10) : null,
+        });
+    }
+    return out;
+}
+"""
+
+SCROLL_JS = "() => window.scrollTo(0, document.body.scrollHeight)"
+
+
+async def harvest_rows(page, label: str, max_steps=60, stable_rounds=2, scroll_pause=750, sport="all"):
+    """Scroll the listing and yield batches of newly appeared rows.
+
+    Stops once `stable_rounds` consecutive scrolls surface no new rows, or
+    after `max_steps` scrolls. Rows are tagged in the page as they are read,
+    so each batch only carries rows the caller has not seen yet. A failure
+    mid-page ends the harvest without losing the batches already yielded.
+    """
+    total = 0
+    stable = 0
+    step = 0
+
+    for step in range(max_steps):
+        try:
+            batch = await page.evaluate(HARVEST_JS, GAME_ROW_SELECTOR)
+        except Exception as e:
+            # Whatever was already yielded stays with the caller
+            log.warning(f"[{label}] Harvest stopped at step {step} after {total} rows: {e}")
+            return
+
+        if batch:
+            total += len(batch)
+            stable = 0
+            yield batch
+        else:
+            stable += 1
+            if stable >= stable_rounds:
+                break
+
+        try:
+            await page.evaluate(SCROLL_JS)
+            with stage_timer("scroll_wait", sport):
+                await page.wait_for_timeout(scroll_pause)
+        except Exception as e:
+            log.warning(f"[{label}] Scroll failed at step {step} after {total} rows: {e}")
+            return
+
+    log.info(f"[{label}] Harvested {total} rows in {step + 1} steps")
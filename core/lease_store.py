@@ -0,0 +1,182 @@
+# core/lease_store.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+from core.utils import get_logger
+
+log = get_logger()
+
+# Seconds a claim is good for without a heartbeat
+LEASE_SECONDS = 120
+# Claims of one item before it is given up as failed
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    crawl_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (crawl_id, key)
+);
+CREATE INDEX IF NOT EXISTS leases_claimable ON leases (status, lease_until, created);
+"""
+
+
+class Lease(NamedTuple):
+    crawl_id: str
+    key: str
+    kind: str
+    payload: dict
+    attempts: int
+
+
+class LeaseStore:
+    """Work items shared by scraper nodes through one SQLite file.
+
+    Items are pending until a worker claims them for `lease_seconds`. The
+    worker heartbeats to keep the claim and completes or fails it; a claim
+    that runs out is handed to the next worker that asks. Only the current
+    holder can complete an item, so a node that stalled past its lease can't
+    overwrite the result of the node that took over.
+    """
+
+    def __init__(self, path, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, work):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = work(conn)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def submit(self, crawl_id: str, items) -> int:
+        """Add (key, kind, payload) items; keys already in this crawl are left alone."""
+        now = time.time()
+        rows = [(crawl_id, key, kind, json.dumps(payload), now, now) for key, kind, payload in items]
+
+        def work(conn):
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO leases (crawl_id, key, kind, payload, created, updated) "
+                             "VALUES (?, ?, ?, ?, ?, ?)", rows)
+            return conn.total_changes - before
+
+        return self._transaction(work)
+
+    def claim(self, worker: str, limit=1, kinds=None) -> list[Lease]:
+        """Claim up to `limit` pending or expired items, oldest first."""
+        now = time.time()
+        kind_filter = f" AND kind IN ({','.join('?' * len(kinds))})" if kinds else ""
+
+        def work(conn):
+            # A claim that ran out on its last attempt is given up rather than reclaimed
+            conn.execute("UPDATE leases SET status = 'failed', error = 'lease expired', worker = NULL, "
+                         "lease_until = NULL, updated = ? "
+                         "WHERE status = 'claimed' AND lease_until < ? AND attempts >= ?",
+                         (now, now, self.max_attempts))
+            rows = conn.execute(
+                "SELECT crawl_id, key, kind, payload, attempts FROM leases "
+                "WHERE (status = 'pending' OR (status = 'claimed' AND lease_until < ?))" + kind_filter +
+                " ORDER BY created, rowid LIMIT ?", (now, *(kinds or ()), limit)).fetchall()
+            for crawl_id, key, _, _, attempts in rows:
+                conn.execute("UPDATE leases SET status = 'claimed', worker = ?, lease_until = ?, "
+                             "attempts = ?, updated = ? WHERE crawl_id = ? AND key = ?",
+                             (worker, now + self.lease_seconds, attempts + 1, now, crawl_id, key))
+            return [Lease(crawl_id, key, kind, json.loads(payload), attempts + 1)
+                    for crawl_id, key, kind, payload, attempts in rows]
+
+        return self._transaction(work)
+
+    def heartbeat(self, worker: str, leases) -> set:
+        """Extend this worker's claims; returns the (crawl_id, key) pairs it still holds."""
+        now = time.time()
+
+        def work(conn):
+            held = set()
+            for lease in leases:
+                cursor = conn.execute(
+                    "UPDATE leases SET lease_until = ?, updated = ? "
+                    "WHERE crawl_id = ? AND key = ? AND status = 'claimed' AND worker = ?",
+                    (now + self.lease_seconds, now, lease.crawl_id, lease.key, worker))
+                if cursor.rowcount:
+                    held.add((lease.crawl_id, lease.key))
+            return held
+
+        return self._transaction(work)
+
+    def complete(self, worker: str, lease: Lease, result, follow_up=()) -> bool:
+        """Store the result and submit `follow_up` items, if the worker still holds the claim."""
+        now = time.time()
+
+        def work(conn):
+            cursor = conn.execute(
+                "UPDATE leases SET status = 'done', result = ?, error = NULL, lease_until = NULL, updated = ? "
+                "WHERE crawl_id = ? AND key = ? AND status = 'claimed' AND worker = ?",
+                (json.dumps(result), now, lease.crawl_id, lease.key, worker))
+            if not cursor.rowcount:
+                return False
+            conn.executemany("INSERT OR IGNORE INTO leases (crawl_id, key, kind, payload, created, updated) "
+                             "VALUES (?, ?, ?, ?, ?, ?)",
+                             [(lease.crawl_id, key, kind, json.dumps(payload), now, now)
+                              for key, kind, payload in follow_up])
+            return True
+
+        done = self._transaction(work)
+        if not done:
+            log.warning(f"[LEASE] {worker} lost {lease.key} before completing it; result dropped")
+        return done
+
+    def fail(self, worker: str, lease: Lease, error: str):
+        """Release the claim for another attempt, or mark it failed after `max_attempts`."""
+        status = "failed" if lease.attempts >= self.max_attempts else "pending"
+        self._transaction(lambda conn: conn.execute(
+            "UPDATE leases SET status = ?, error = ?, worker = NULL, lease_until = NULL, updated = ? "
+            "WHERE crawl_id = ? AND key = ? AND status = 'claimed' AND worker = ?",
+            (status, error, time.time(), lease.crawl_id, lease.key, worker)))
+
+    def progress(self, crawl_id: str) -> dict:
+        rows = self._conn().execute(
+            "SELECT kind, status, COUNT(*) FROM leases WHERE crawl_id = ? GROUP BY kind, status",
+            (crawl_id,)).fetchall()
+        progress = {}
+        for kind, status, count in rows:
+            progress.setdefault(kind, {})[status] = count
+        return progress
+
+    def results(self, crawl_id: str, kind: str) -> dict:
+        """key -> result for the completed items of one kind."""
+        rows = self._conn().execute(
+            "SELECT key, result FROM leases WHERE crawl_id = ? AND kind = ? AND status = 'done'",
+            (crawl_id, kind)).fetchall()
+        return {key: json.loads(result) for key, result in rows}
@@ -1,42 +1,44 @@
 import asyncio
 import os
-import json
-import pandas as pd
 from datetime import datetime
 from core.utils import get_logger
-from core.fetch_matches import fetch_matches
+from core.metrics import timed
+from core.fetch_matches import iter_matches
+from core.pipeline import CONSOLIDATED_FIELDS, CsvWriter, drain, flat_row, map_chunks
 from utils.user_agent_pool import get_random_user_agent
 
 logger = get_logger()
 
-def save_results(matches):
+
+def consolidated_path():
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+    return os.path.join("output", f"consolidated_matches_{timestamp}.csv")
+
+
+@timed("save_results")
+def save_results(matches, output_path=None):
     if not matches:
         logger.warning("No matches to save.")
         return
 
-    flat = []
-    for match in matches:
-        try:
-            team1, team2 = match.get("teams", " vs ").split(" vs ", 1)
-        except ValueError:
-            team1, team2 = match.get("teams", ""), ""
-
-        flat.append({
-            "datetime": match.get("datetime", ""),
-            "league": match.get("league", ""),
-            "team1": team1,
-            "team2": team2,
-            "odds": json.dumps(match.get("odds", []), ensure_ascii=False),
-            "match_url": match.get("match_url", "")
-        })
-
-    df = pd.DataFrame(flat)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-    output_path = os.path.join("output", f"consolidated_matches_{timestamp}.csv")
-    df.to_csv(output_path, index=False)
+    output_path = output_path or consolidated_path()
+    with CsvWriter(output_path, CONSOLIDATED_FIELDS) as writer:
+        writer.write([flat_row(match) for match in matches])
     logger.info(f"[✔] Results saved to: {output_path}")
 
 
+async def stream_results(**kwargs) -> int:
+    """Crawl straight into the consolidated CSV a chunk at a time, never holding the whole crawl."""
+    output_path = consolidated_path()
+    with CsvWriter(output_path, CONSOLIDATED_FIELDS) as writer:
+        count = await drain(map_chunks(iter_matches(**kwargs), flat_row), writer)
+    if count:
+        logger.info(f"[✔] Results saved to: {output_path}")
+    else:
+        logger.warning("No matches to save.")
+    return count
+
+
 def main():
     logger.info("[*] Starting OddsPortal Scraper...")
     proxy = None  # Disable for testing
@@ -44,9 +46,8 @@ def main():
     logger.info(f"[*] Using UA: {user_agent}")
 
     try:
-        matches = asyncio.run(fetch_matches(proxy=proxy, user_agent=user_agent))
-        logger.info(f"[+] Total matches scraped: {len(matches)}")
-        save_results(matches)
+        count = asyncio.run(stream_results(proxy=proxy, user_agent=user_agent))
+        logger.info(f"[+] Total matches scraped: {count}")
     except Exception as e:
         logger.error(f"[!] Critical failure: {str(e)}")
 
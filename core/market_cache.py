@@ -0,0 +1,160 @@
+# core/market_cache.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from core.metrics import MARKET_CACHE_EVICTIONS, MARKET_CACHE_LOOKUPS
+from core.refresh_queue import kickoff_interval, parse_kickoff
+from core.utils import get_logger
+
+log = get_logger()
+
+CACHE_DIR = os.path.join("./output", ".market_cache")
+MEMORY_ENTRIES = 2048
+DISK_ENTRIES = 50_000
+# Freshness for matches whose kickoff we don't know (seconds)
+DEFAULT_TTL = 60 * 60
+# A match this long past kickoff is over (seconds); until then it refreshes as in-play
+IN_PLAY_WINDOW = 3 * 60 * 60
+# Markets of a finished match don't move any more
+FINISHED_TTL = 7 * 24 * 60 * 60
+
+
+def market_ttl(kickoff: float | None, now: float) -> float:
+    """How long a match's markets stay fresh: minutes near kickoff and in play, hours far out, days once over."""
+    if kickoff is not None and now - kickoff >= IN_PLAY_WINDOW:
+        return FINISHED_TTL
+    return kickoff_interval(kickoff - now if kickoff is not None else None, DEFAULT_TTL)
+
+
+class MarketCache:
+    """extract_markets results by match URL: an in-memory LRU over one JSON file per URL.
+
+    An entry is fresh while its age is under `market_ttl` for the match's
+    kickoff, both as of now and as of when it was stored: the same entry
+    expires sooner the closer kickoff gets, and a finished match is fetched
+    once more before its long TTL applies.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_entries=MEMORY_ENTRIES, max_disk_entries=DISK_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_count = None
+        self.counts = {"memory_hit": 0, "disk_hit": 0, "miss": 0, "expired": 0,
+                       "memory_evicted": 0, "disk_evicted": 0}
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _count(self, result: str, n=1):
+        self.counts[result] += n
+        if result.endswith("evicted"):
+            MARKET_CACHE_EVICTIONS.labels(tier=result.split("_")[0]).inc(n)
+        else:
+            MARKET_CACHE_LOOKUPS.labels(result=result).inc(n)
+
+    def _remember(self, url: str, entry: dict):
+        self._memory[url] = entry
+        self._memory.move_to_end(url)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._count("memory_evicted")
+
+    def get(self, url: str, kickoff=None, now=None):
+        """(market, odds) if a fresh entry exists, else None."""
+        now = time.time() if now is None else now
+        kickoff = parse_kickoff(kickoff) if isinstance(kickoff, str) else kickoff
+
+        with self._lock:
+            entry = self._memory.get(url)
+            if entry is not None:
+                self._memory.move_to_end(url)
+                tier = "memory_hit"
+            else:
+                try:
+                    with open(self._path(url), "r", encoding="utf-8") as f:
+                        entry = json.load(f)
+                except (OSError, ValueError):
+                    self._count("miss")
+                    return None
+                self._remember(url, entry)
+                tier = "disk_hit"
+
+            kickoff = kickoff if kickoff is not None else entry.get("kickoff")
+            ttl = min(market_ttl(kickoff, now), market_ttl(kickoff, entry["stored_at"]))
+            if now - entry["stored_at"] >= ttl:
+                self._count("expired")
+                return None
+            self._count(tier)
+            return entry["market"], entry["odds"]
+
+    def put(self, url: str, market, odds, kickoff=None, now=None):
+        now = time.time() if now is None else now
+        kickoff = parse_kickoff(kickoff) if isinstance(kickoff, str) else kickoff
+        entry = {"url": url, "stored_at": now, "kickoff": kickoff, "market": market, "odds": odds}
+
+        with self._lock:
+            self._remember(url, entry)
+
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(url)
+            is_new = not os.path.exists(path)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+
+            if self._disk_count is None:
+                self._disk_count = len(os.listdir(self.directory))
+            elif is_new:
+                self._disk_count += 1
+            if self._disk_count > self.max_disk_entries:
+                self._prune_disk()
+
+    def _prune_disk(self):
+        """Drop the least recently written files down to 90% of the bound."""
+        files = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                files.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        files.sort()
+        excess = len(files) - int(self.max_disk_entries * 0.9)
+        for _, path in files[:max(excess, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._disk_count = len(files) - max(excess, 0)
+        self._count("disk_evicted", max(excess, 0))
+        log.info(f"[MARKETS] Pruned {max(excess, 0)} cached match pages from disk")
+
+    def stats(self) -> dict:
+        lookups = self.counts["memory_hit"] + self.counts["disk_hit"] + self.counts["miss"] + self.counts["expired"]
+        hits = self.counts["memory_hit"] + self.counts["disk_hit"]
+        return {
+            **self.counts,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+            "memory_entries": len(self._memory),
+            "disk_entries": self._disk_count,
+        }
+
+
+_cache = None
+
+
+def get_market_cache() -> MarketCache:
+    """Process-wide cache shared by every extract_markets call."""
+    global _cache
+    if _cache is None:
+        _cache = MarketCache()
+    return _cache
@@ -0,0 +1,44 @@
+# core/match_time.py
+
+import datetime
+
+import pandas as pd
+
+# "Tomorrow, 05 Jul", "05 Jul 2025", "Today, 04 Jul  - Play Offs"
+DATE_HEADER_PATTERN = r"(?P<day>\d{1,2})\s+(?P<month>[A-Za-z]{3})[A-Za-z]*(?:\s+(?P<year>\d{4}))?"
+TIME_PATTERN = r"(?P<hour>\d{1,2}):(?P<minute>\d{2})"
+
+# Listings are loaded with timezone_id="UTC", so the times they show are UTC
+BROWSER_TIMEZONE = "UTC"
+
+
+def parse_kickoffs(headers, times, reference=None) -> list:
+    """Combine per-row date headers and kickoff times into UTC datetimes.
+
+    Parses a whole batch with vectorized string ops. Headers without a year
+    get the year that puts the date closest to `reference` (defaults to now),
+    so listings spanning New Year land on the right side. Rows that cannot
+    be parsed come back as None.
+    """
+    if reference is None:
+        reference = datetime.datetime.now(datetime.timezone.utc)
+    elif reference.tzinfo is None:
+        reference = reference.replace(tzinfo=datetime.timezone.utc)
+
+    frame = pd.DataFrame({"header": headers, "time": times}, dtype="string")
+    dates = frame["header"].str.extract(DATE_HEADER_PATTERN)
+    clock = frame["time"].str.extract(TIME_PATTERN)
+
+    year = dates["year"].fillna(str(reference.year))
+    text = (dates["day"] + " " + dates["month"].str.title() + " " + year
+            + " " + clock["hour"] + ":" + clock["minute"])
+    kickoff = pd.to_datetime(text, format="%d %b %Y %H:%M", errors="coerce", utc=True)
+
+    # Only infer the year when the page did not print one
+    inferred = dates["year"].isna()
+    ref = pd.Timestamp(reference)
+    half_year = pd.Timedelta(days=183)
+    kickoff = kickoff.mask(inferred & (kickoff - ref > half_year), kickoff - pd.DateOffset(years=1))
+    kickoff = kickoff.mask(inferred & (ref - kickoff > half_year), kickoff + pd.DateOffset(years=1))
+
+    return [None if pd.isna(value) else value.to_pydatetime() for value in kickoff]
@@ -0,0 +1,101 @@
+# core/metrics.py
+
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+RATE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+STAGE_DURATION = Histogram(
+    "scraper_stage_duration_seconds",
+    "Time spent in each scrape pipeline stage",
+    ["stage", "sport"],
+    buckets=STAGE_BUCKETS,
+)
+ROWS_PER_SECOND = Histogram(
+    "scraper_rows_per_second",
+    "Rows extracted per second of listing time",
+    ["sport"],
+    buckets=RATE_BUCKETS,
+)
+ROWS_SCRAPED = Counter(
+    "scraper_rows_total",
+    "Match rows extracted",
+    ["sport"],
+)
+FAILURES = Counter(
+    "scraper_failures_total",
+    "Stages that raised",
+    ["stage", "sport"],
+)
+BROWSER_LAUNCHES = Counter(
+    "scraper_browser_launches_total",
+    "Chromium instances launched",
+)
+PAGE_BYTES = Counter(
+    "scraper_page_bytes_total",
+    "Bytes behind listing page loads, by network or Chromium disk cache",
+    ["source"],
+)
+MARKET_CACHE_LOOKUPS = Counter(
+    "scraper_market_cache_total",
+    "extract_markets cache lookups by outcome",
+    ["result"],
+)
+MARKET_CACHE_EVICTIONS = Counter(
+    "scraper_market_cache_evictions_total",
+    "Market cache entries evicted by tier",
+    ["tier"],
+)
+
+
+@contextmanager
+def stage_timer(stage: str, sport: str = "all"):
+    """Time a block as one pipeline stage; exceptions also count as a failure."""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        FAILURES.labels(stage=stage, sport=sport).inc()
+        raise
+    finally:
+        STAGE_DURATION.labels(stage=stage, sport=sport).observe(time.perf_counter() - started)
+
+
+def timed(stage: str, sport: str = "all"):
+    """Decorator form of stage_timer for sync and async functions."""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage_timer(stage, sport):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage, sport):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_rows(sport: str, rows: int, seconds: float):
+    ROWS_SCRAPED.labels(sport=sport).inc(rows)
+    if seconds > 0:
+        ROWS_PER_SECOND.labels(sport=sport).observe(rows / seconds)
+
+
+def render_latest():
+    """Prometheus text exposition of every metric in this process, or of every
+    worker's when PROMETHEUS_MULTIPROC_DIR is set (needed with several uvicorn workers)."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
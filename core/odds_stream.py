@@ -0,0 +1,113 @@
+# core/odds_stream.py
+
+import asyncio
+from collections import deque
+
+from core.crawl_planner import match_key, sport_key
+from core.utils import get_logger
+
+log = get_logger()
+
+# Deltas kept so a reconnecting client can catch up instead of refetching
+HISTORY = 50
+# Messages buffered per subscriber before it is told to refetch instead
+SUBSCRIBER_BUFFER = 100
+
+CHANGED_FIELDS = ("odds", "odds_columns", "bookmakers")
+
+
+def diff_matches(old: list[dict], new: list[dict]) -> list[tuple]:
+    """(sport key, kind, item) changes from `old` to `new`.
+
+    Kinds are "added" (the whole match), "changed" (id plus odds fields) and
+    "removed" (id only), so a generation where a few odds moved is a few
+    small items rather than the whole table.
+    """
+    previous = {match_key(m): m for m in old}
+    changes = []
+    for match in new:
+        key = match_key(match)
+        before = previous.pop(key, None)
+        if before is None:
+            changes.append((sport_key(match), "added", {"id": key, **match}))
+        elif any(before.get(field) != match.get(field) for field in CHANGED_FIELDS):
+            changes.append((sport_key(match), "changed",
+                            {"id": key, **{field: match.get(field) for field in CHANGED_FIELDS}}))
+    for key, match in previous.items():
+        changes.append((sport_key(match), "removed", key))
+    return changes
+
+
+class OddsDelta:
+    """One generation's changes, rendered per subscriber filter."""
+
+    __slots__ = ("generation", "base", "changes")
+
+    def __init__(self, generation: int, base: int, changes: list[tuple]):
+        self.generation = generation
+        self.base = base
+        self.changes = changes
+
+    def message(self, sports=None) -> dict:
+        message = {"type": "delta", "generation": self.generation, "base": self.base,
+                   "added": [], "changed": [], "removed": []}
+        for sport, kind, item in self.changes:
+            if sports is None or sport in sports:
+                message[kind].append(item)
+        return message
+
+
+class Subscriber:
+    def __init__(self, sports=None):
+        self.sports = set(sports) if sports else None
+        self.queue = asyncio.Queue(SUBSCRIBER_BUFFER)
+
+
+class OddsBroadcaster:
+    """Fans odds deltas out to websocket subscribers, each with its own sport filter."""
+
+    def __init__(self, history=HISTORY):
+        self.subscribers = set()
+        self.history = deque(maxlen=history)
+
+    def publish(self, generation: int, base: int, old: list[dict], new: list[dict]):
+        """Diff two generations, keep the delta for catching up and queue it for every subscriber.
+
+        The history is kept with nobody subscribed too: the dashboard only
+        connects for a moment per rerun, so it is usually replaying.
+        """
+        delta = OddsDelta(generation, base, diff_matches(old, new))
+        self.history.append(delta)
+        for subscriber in list(self.subscribers):
+            self._send(subscriber, delta.message(subscriber.sports))
+        log.info(f"[STREAM] Generation {generation}: {len(delta.changes)} changes "
+                 f"to {len(self.subscribers)} subscribers")
+
+    def _send(self, subscriber: Subscriber, message: dict):
+        try:
+            subscriber.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too far behind to catch up delta by delta; have it refetch
+            while not subscriber.queue.empty():
+                subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait({"type": "reset", "generation": message["generation"]})
+
+    def subscribe(self, sports=None, since=None, current=0) -> Subscriber:
+        """Register a subscriber, replaying deltas after generation `since` when history allows."""
+        subscriber = Subscriber(sports)
+        self.subscribers.add(subscriber)
+        subscriber.queue.put_nowait({"type": "hello", "generation": current,
+                                     "sports": sorted(subscriber.sports) if subscriber.sports else None})
+        if since is None or since == current:
+            return subscriber
+
+        backlog = [delta for delta in self.history if delta.generation > since]
+        if backlog and backlog[0].base == since:
+            for delta in backlog:
+                self._send(subscriber, delta.message(subscriber.sports))
+        else:
+            self._send(subscriber, {"type": "reset", "generation": current})
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
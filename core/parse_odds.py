@@ -2,23 +2,48 @@
 
 from playwright.sync_api import sync_playwright
 import time
+from core.metrics import BROWSER_LAUNCHES, stage_timer, timed
+from core.market_cache import get_market_cache
 
 
-def extract_markets(match_url, proxy=None, user_agent=None):
+def extract_markets(match_url, proxy=None, user_agent=None, kickoff=None, use_cache=True):
+    """(market, odds) for a match page, served from the market cache while fresh.
+
+    `kickoff` (ISO string or epoch seconds) shortens the cache TTL as the
+    match approaches; pages that yield no markets are never cached.
+    """
+    cache = get_market_cache() if use_cache else None
+    if cache:
+        cached = cache.get(match_url, kickoff=kickoff)
+        if cached is not None:
+            return cached
+
+    result_market, result_odds = fetch_markets(match_url, proxy=proxy, user_agent=user_agent)
+    if cache and result_odds:
+        cache.put(match_url, result_market, result_odds, kickoff=kickoff)
+    return result_market, result_odds
+
+
+@timed("extract_markets")
+def fetch_markets(match_url, proxy=None, user_agent=None):
     result_market = None
     result_odds = {}
 
     try:
         with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                user_agent=user_agent,
-                proxy={"server": proxy} if proxy else None,
-                viewport={"width": 1280, "height": 800}
-            )
-            page = context.new_page()
-            page.goto(match_url, timeout=30000)
-            page.wait_for_timeout(3000)
+            with stage_timer("markets_browser_launch"):
+                browser = p.chromium.launch(headless=True)
+                BROWSER_LAUNCHES.inc()
+                context = browser.new_context(
+                    user_agent=user_agent,
+                    proxy={"server": proxy} if proxy else None,
+                    viewport={"width": 1280, "height": 800}
+                )
+                page = context.new_page()
+            with stage_timer("markets_goto"):
+                page.goto(match_url, timeout=30000)
+            with stage_timer("markets_fixed_wait"):
+                page.wait_for_timeout(3000)
 
             # Click "Show more markets" if it exists
             try:
@@ -30,27 +55,28 @@ def extract_markets(match_url, proxy=None, user_agent=None):
             except:
                 pass
 
-            tables = page.query_selector_all("div#odds-data-table")
+            with stage_timer("markets_extraction"):
+                tables = page.query_selector_all("div#odds-data-table")
 
-            for table in tables:
-                header = table.query_selector("h2")
-                if not header:
-                    continue
-                market_name = header.inner_text().strip().lower()
+                for table in tables:
+                    header = table.query_selector("h2")
+                    if not header:
+                        continue
+                    market_name = header.inner_text().strip().lower()
 
-                if "moneyline" in market_name or "1x2" in market_name:
-                    result_market = "Moneyline"
-                    result_odds["Moneyline"] = extract_odds_from_table(table)
+                    if "moneyline" in market_name or "1x2" in market_name:
+                        result_market = "Moneyline"
+                        result_odds["Moneyline"] = extract_odds_from_table(table)
 
-                elif "draw no bet" in market_name:
-                    result_odds["Draw No Bet"] = extract_odds_from_table(table)
+                    elif "draw no bet" in market_name:
+                        result_odds["Draw No Bet"] = extract_odds_from_table(table)
 
-                elif "double chance" in market_name:
-                    result_odds["Double Chance"] = extract_odds_from_table(
-                        table)
+                    elif "double chance" in market_name:
+                        result_odds["Double Chance"] = extract_odds_from_table(
+                            table)
 
-                elif "spread" in market_name or "handicap" in market_name:
-                    result_odds["Spread"] = extract_odds_from_table(table)
+                    elif "spread" in market_name or "handicap" in market_name:
+                        result_odds["Spread"] = extract_odds_from_table(table)
 
             browser.close()
 
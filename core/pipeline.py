@@ -0,0 +1,160 @@
+# core/pipeline.py
+#
+# Streaming crawl pipeline: matches flow through in fixed-size chunks
+#
+#   extract (crawl a listing) -> normalize -> dedupe -> writers
+#
+# The queue between the crawlers and the consumer is bounded, so when the
+# writers fall behind, crawlers wait before starting their next listing. Peak
+# memory is then about `concurrency` listings in flight plus `queue_chunks`
+# chunks, however many listings the crawl covers.
+
+import asyncio
+import csv
+import json
+import os
+
+from core.crawl_planner import match_key, with_league_label
+
+CHUNK_SIZE = int(os.getenv("PIPELINE_CHUNK_SIZE", "500"))
+# Chunks buffered between the crawlers and the consumer before crawlers block
+QUEUE_CHUNKS = 4
+
+CONSOLIDATED_FIELDS = ("datetime", "league", "team1", "team2", "team1_id", "team2_id", "odds", "match_url")
+
+
+def chunked(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+async def stream_listings(tasks, crawl, concurrency=3, chunk_size=CHUNK_SIZE, queue_chunks=QUEUE_CHUNKS):
+    """Run `crawl(task)` over the listings, `concurrency` at a time, yielding chunks of matches as they land."""
+    queue = asyncio.Queue(queue_chunks)
+    pending = iter(tasks)
+
+    async def worker():
+        for task in pending:
+            matches = await crawl(task)
+            for chunk in chunked(matches, chunk_size):
+                await queue.put(chunk)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    # Done once every crawler has finished, or as soon as one raises
+    producer = asyncio.gather(*workers)
+    getter = None
+    try:
+        while not (producer.done() and queue.empty()):
+            if not queue.empty():
+                yield queue.get_nowait()
+                continue
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield getter.result()
+            else:
+                getter.cancel()
+        # Surface a crawler that raised
+        producer.result()
+    finally:
+        if getter is not None:
+            getter.cancel()
+        # The consumer stopped early or a crawler raised: the others may be blocked on
+        # a full queue, so cancel them and let them unwind before the stream closes
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(producer, *workers, return_exceptions=True)
+
+
+async def dedupe_chunks(chunks):
+    """Drop matches already seen earlier in the stream, keeping the first; only keys are remembered.
+
+    A kept copy from a daily listing can't be patched once it is emitted, so
+    it is labelled with its league page up front (as dedupe_matches would).
+    """
+    seen = set()
+    async for chunk in chunks:
+        fresh = []
+        for match in chunk:
+            key = match_key(match)
+            if key not in seen:
+                seen.add(key)
+                fresh.append(with_league_label(match))
+        if fresh:
+            yield fresh
+
+
+async def map_chunks(chunks, transform):
+    async for chunk in chunks:
+        yield [transform(item) for item in chunk]
+
+
+def flat_row(match: dict) -> dict:
+    """A match as one row of the consolidated CSV."""
+    team1, team2 = match.get("team1"), match.get("team2")
+    if team1 is None:
+        # Older records carry one "A vs B" string
+        try:
+            team1, team2 = match.get("teams", " vs ").split(" vs ", 1)
+        except ValueError:
+            team1, team2 = match.get("teams", ""), ""
+
+    return {
+        "datetime": match.get("datetime", ""),
+        "league": match.get("league", ""),
+        "team1": team1,
+        "team2": team2,
+        "team1_id": match.get("team1_id", ""),
+        "team2_id": match.get("team2_id", ""),
+        "odds": json.dumps(match.get("odds", []), ensure_ascii=False),
+        "match_url": match.get("match_url", "")
+    }
+
+
+class CsvWriter:
+    """Appends chunks of rows to a CSV as they arrive; the file is only created once there's a row."""
+
+    def __init__(self, path, fieldnames=None):
+        self.path = path
+        self.fieldnames = fieldnames
+        self.rows = 0
+        self._file = None
+        self._writer = None
+
+    def write(self, rows: list[dict]):
+        if not rows:
+            return
+        if self._writer is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+            self._writer = csv.DictWriter(self._file, self.fieldnames or list(rows[0]),
+                                          restval="", extrasaction="ignore")
+            self._writer.writeheader()
+        self._writer.writerows(rows)
+        self.rows += len(rows)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_csv(path, rows: list[dict]):
+    """One-shot CSV with every key seen as a column, in first-seen order (as a DataFrame would)."""
+    with CsvWriter(path, list(dict.fromkeys(key for row in rows for key in row))) as writer:
+        writer.write(rows)
+
+
+async def drain(chunks, *writers) -> int:
+    """Feed every chunk to each writer; returns the number of items written."""
+    count = 0
+    async for chunk in chunks:
+        for writer in writers:
+            writer.write(chunk)
+        count += len(chunk)
+    return count
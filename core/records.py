@@ -0,0 +1,60 @@
+# core/records.py
+
+from core.crawl_planner import league_for_url
+from core.team_names import canonical_team
+from core.url_parser import parse_match_url
+
+# Outcome columns per sport, in listing order. Anything the row shows beyond
+# these stays in the full `odds` list.
+THREE_WAY = ["1", "X", "2"]
+TWO_WAY = ["1", "2"]
+
+ODDS_SCHEMAS = {
+    "Football": THREE_WAY,
+    "Futsal": THREE_WAY,
+    "Hockey": THREE_WAY,
+    "Handball": THREE_WAY,
+    "American Football": TWO_WAY,
+    "Basketball": TWO_WAY,
+    "Tennis": TWO_WAY,
+    "Baseball": TWO_WAY,
+    "Volleyball": TWO_WAY,
+}
+
+BOOKMAKERS_LABEL = "B's"
+
+
+def odds_columns(sport: str, odds: list, labels=None) -> dict:
+    """Map odds to outcome labels, preferring the labels the page printed."""
+    if labels:
+        labels = [label for label in labels if label != BOOKMAKERS_LABEL]
+    if not labels or len(labels) > len(odds):
+        labels = ODDS_SCHEMAS.get(sport, [str(n) for n in range(1, len(odds) + 1)])
+    return dict(zip(labels, odds))
+
+
+def build_match(team1, team2, odds, match_datetime, match_url, league=None,
+                bookmakers=None, columns=None) -> dict:
+    """Assemble a match record with sport/country/competition parsed from its URL.
+
+    team1_id/team2_id are canonical team ids (see core.team_names), stable
+    across spellings, listings and days.
+    """
+    path = parse_match_url(match_url)
+    return {
+        "datetime": match_datetime.isoformat() if match_datetime else "",
+        # Daily listings show league-page matches too; label them the same either way
+        "league": league or league_for_url(match_url) or path.sport,
+        "sport": path.sport,
+        "country": path.country,
+        "competition": path.competition,
+        "match_id": path.match_id,
+        "team1": team1,
+        "team2": team2,
+        "team1_id": canonical_team(team1, path.sport),
+        "team2_id": canonical_team(team2, path.sport),
+        "odds": odds,
+        "odds_columns": odds_columns(path.sport, odds, columns),
+        "bookmakers": bookmakers,
+        "match_url": match_url
+    }
@@ -0,0 +1,192 @@
+# core/refresh_queue.py
+
+import asyncio
+import datetime
+import heapq
+import itertools
+import math
+import time
+
+from core.crawl_planner import match_key
+
+# (time-to-kickoff upper bound in seconds, refresh interval in seconds).
+# Odds move most in the last hours before kickoff, so that's where the budget goes.
+KICKOFF_INTERVALS = [
+    (60 * 60, 2 * 60),
+    (6 * 60 * 60, 10 * 60),
+    (24 * 60 * 60, 30 * 60),
+    (7 * 24 * 60 * 60, 3 * 60 * 60),
+]
+FAR_INTERVAL = 12 * 60 * 60
+
+MIN_INTERVAL = 60
+
+# A listing whose odds moved by ~10% on average refreshes twice as often
+VOLATILITY_WEIGHT = 10.0
+# Smoothing for the per-key volatility estimate
+VOLATILITY_ALPHA = 0.5
+
+
+def parse_kickoff(value) -> float | None:
+    try:
+        kickoff = datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if kickoff.tzinfo is None:
+        kickoff = kickoff.replace(tzinfo=datetime.timezone.utc)
+    return kickoff.timestamp()
+
+
+def kickoff_interval(seconds_to_kickoff: float | None, default: float) -> float:
+    if seconds_to_kickoff is None:
+        return default
+    for bound, interval in KICKOFF_INTERVALS:
+        if seconds_to_kickoff <= bound:
+            return interval
+    return FAR_INTERVAL
+
+
+def odds_values(odds) -> list[float]:
+    values = []
+    for odd in odds or []:
+        try:
+            values.append(float(odd))
+        except (TypeError, ValueError):
+            values.append(math.nan)
+    return values
+
+
+class RefreshEntry:
+    __slots__ = ("key", "due_at", "kickoff", "volatility", "runs")
+
+    def __init__(self, key):
+        self.key = key
+        self.due_at = 0.0
+        self.kickoff = None
+        self.volatility = 0.0
+        self.runs = 0
+
+
+class RefreshQueue:
+    """Refresh tasks ordered by due time, where the due time shrinks with
+    proximity to kickoff and with observed odds volatility.
+
+    Rescheduling pushes a new heap entry; stale ones are dropped lazily on pop.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}
+        self._seq = itertools.count()
+        self._last_odds = {}
+        self._in_flight = set()
+        self._wakeup = asyncio.Event()
+        self._lag_total = 0.0
+        self._popped = 0
+        self._last_lag = 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def schedule(self, key: str, due_at: float):
+        entry = self._entries.setdefault(key, RefreshEntry(key))
+        entry.due_at = due_at
+        kickoff = entry.kickoff if entry.kickoff is not None else math.inf
+        heapq.heappush(self._heap, (due_at, kickoff, next(self._seq), key))
+        self._wakeup.set()
+
+    def remove(self, key: str):
+        self._entries.pop(key, None)
+        self._last_odds.pop(key, None)
+
+    def observe(self, key: str, matches: list[dict], default_interval: float, now=None) -> float:
+        """Update kickoff and volatility for `key` from fresh results.
+
+        Returns the interval until its next refresh; the caller schedules it.
+        """
+        now = time.time() if now is None else now
+        entry = self._entries.setdefault(key, RefreshEntry(key))
+        entry.runs += 1
+
+        upcoming = [k for k in (parse_kickoff(m.get("datetime")) for m in matches) if k and k >= now]
+        entry.kickoff = min(upcoming) if upcoming else None
+
+        # Only the latest odds per match of this key are kept, so memory tracks the live set
+        last_odds = self._last_odds.get(key, {})
+        latest = {}
+        moves = []
+        for match in matches:
+            mkey = match_key(match)
+            current = odds_values(match.get("odds"))
+            previous = last_odds.get(mkey)
+            latest[mkey] = current
+            if previous and len(previous) == len(current):
+                deltas = [abs(math.log(c / p)) for p, c in zip(previous, current)
+                          if p > 0 and c > 0]
+                if deltas:
+                    moves.append(max(deltas))
+        self._last_odds[key] = latest
+        if moves:
+            observed = sum(moves) / len(moves)
+            entry.volatility = VOLATILITY_ALPHA * observed + (1 - VOLATILITY_ALPHA) * entry.volatility
+
+        seconds_to_kickoff = entry.kickoff - now if entry.kickoff is not None else None
+        interval = kickoff_interval(seconds_to_kickoff, default_interval)
+        return max(MIN_INTERVAL, interval / (1 + VOLATILITY_WEIGHT * entry.volatility))
+
+    def _peek(self):
+        while self._heap:
+            due_at, _, _, key = self._heap[0]
+            entry = self._entries.get(key)
+            if entry is None or entry.due_at != due_at or key in self._in_flight:
+                heapq.heappop(self._heap)
+                continue
+            return due_at, key
+        return None
+
+    async def get(self) -> str:
+        """Wait for the most urgent due task and mark it in flight."""
+        while True:
+            self._wakeup.clear()
+            head = self._peek()
+            now = time.time()
+            if head and head[0] <= now:
+                heapq.heappop(self._heap)
+                due_at, key = head
+                self._in_flight.add(key)
+                self._last_lag = now - due_at
+                self._lag_total += self._last_lag
+                self._popped += 1
+                return key
+
+            timeout = head[0] - now if head else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def done(self, key: str):
+        self._in_flight.discard(key)
+        self._wakeup.set()
+
+    def metrics(self, now=None) -> dict:
+        now = time.time() if now is None else now
+        waiting = [e for k, e in self._entries.items() if k not in self._in_flight]
+        overdue = [now - e.due_at for e in waiting if e.due_at <= now]
+        return {
+            "depth": len(waiting),
+            "in_flight": len(self._in_flight),
+            "due": len(overdue),
+            "max_lag_seconds": max(overdue, default=0.0),
+            "last_lag_seconds": self._last_lag,
+            "mean_lag_seconds": self._lag_total / self._popped if self._popped else 0.0,
+            "tasks": {
+                e.key: {
+                    "due_in_seconds": e.due_at - now,
+                    "kickoff": e.kickoff,
+                    "volatility": round(e.volatility, 4),
+                    "runs": e.runs,
+                }
+                for e in sorted(self._entries.values(), key=lambda e: e.due_at)
+            },
+        }
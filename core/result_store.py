@@ -0,0 +1,139 @@
+# core/result_store.py
+
+import fcntl
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from core.utils import get_logger
+
+log = get_logger()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    generation INTEGER NOT NULL,
+    etag TEXT NOT NULL,
+    body TEXT NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+# Small JSON values every worker reads: the scheduler switch, the leader's last status
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+
+class ResultStore:
+    """The latest scrape, shared by every API worker through one SQLite file.
+
+    Each write bumps a generation counter. Workers keep the decoded matches in
+    memory and only re-read the body when the generation has moved, checking
+    at most once per `poll_interval` seconds.
+    """
+
+    def __init__(self, path, poll_interval=1.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        self._last_poll = 0.0
+        self._leader_fd = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            # WAL so readers in other workers never block the writer
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+            conn.execute(STATE_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def write(self, merge):
+        """Replace the results with `merge(current_matches)` atomically.
+
+        Runs inside one write transaction, so two workers merging different
+        sports at once both land. Returns (generation, etag, matches).
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT generation, etag, body FROM results WHERE id = 1").fetchone()
+            matches = merge(json.loads(row[2]) if row else [])
+            body = json.dumps(matches, sort_keys=True, ensure_ascii=False)
+            etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+            if row and row[1] == etag:
+                # Same data (e.g. every listing carried forward): keep the
+                # generation so workers don't reload and clients keep their 304s
+                conn.execute("ROLLBACK")
+                return row[0], etag, matches
+            generation = (row[0] if row else 0) + 1
+            conn.execute("INSERT OR REPLACE INTO results VALUES (1, ?, ?, ?, ?)",
+                         (generation, etag, body, time.time()))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        log.info(f"[STORE] Generation {generation}: {len(matches)} matches")
+        return generation, etag, matches
+
+    def poll(self, generation: int, force=False):
+        """(generation, etag, matches) if the store moved past `generation`, else None."""
+        now = time.monotonic()
+        if not force and now - self._last_poll < self.poll_interval:
+            return None
+        self._last_poll = now
+
+        conn = self._conn()
+        row = conn.execute("SELECT generation FROM results WHERE id = 1").fetchone()
+        if row is None or row[0] == generation:
+            return None
+        row = conn.execute("SELECT generation, etag, body FROM results WHERE id = 1").fetchone()
+        return row[0], row[1], json.loads(row[2])
+
+    def get_state(self, key: str, default=None):
+        row = self._conn().execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_state(self, key: str, value, only_if_missing=False):
+        """Share `value` with every worker; with `only_if_missing`, keep whatever is already set."""
+        verb = "INSERT OR IGNORE" if only_if_missing else "INSERT OR REPLACE"
+        self._conn().execute(f"{verb} INTO state VALUES (?, ?, ?)", (key, json.dumps(value), time.time()))
+
+    def claim_leader(self) -> bool:
+        """Whether this process owns the background jobs (one worker per store).
+
+        Holds an exclusive lock on a sidecar file until release_leader(); the
+        OS drops it if the worker dies, so another can take over.
+        """
+        if self._leader_fd is not None:
+            return True
+        fd = os.open(self.path + ".leader", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._leader_fd = fd
+        return True
+
+    def release_leader(self):
+        """Give up the background jobs so another worker can claim them."""
+        if self._leader_fd is not None:
+            # Closing the descriptor drops the lock
+            os.close(self._leader_fd)
+            self._leader_fd = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader_fd is not None
@@ -0,0 +1,87 @@
+# core/retry.py
+
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+from core.utils import get_logger
+
+log = get_logger()
+
+# Retries shared by all listings of one crawl, so a bad run can't retry forever
+DEFAULT_RUN_BUDGET = 10
+# Minimum seconds between navigations to the same host
+DEFAULT_HOST_INTERVAL = 1.0
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: delay ~ U(0, min(max_delay, base * 2**n))."""
+
+    def __init__(self, attempts=3, base_delay=2.0, max_delay=30.0):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, retry: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry)))
+
+
+class RetryBudget:
+    """Caps the total number of retries spent across one crawl run."""
+
+    def __init__(self, total=DEFAULT_RUN_BUDGET):
+        self.total = total
+        self.used = 0
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.total - self.used)
+
+    def take(self) -> bool:
+        if self.used >= self.total:
+            return False
+        self.used += 1
+        return True
+
+
+class HostRateLimiter:
+    """Spaces out requests per host across every concurrent listing."""
+
+    def __init__(self, min_interval=DEFAULT_HOST_INTERVAL):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, url: str):
+        host = urlsplit(url).netloc
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def with_retries(call, label: str, policy=None, budget=None, retry_on=(Exception,)):
+    """Await `call()` until it succeeds, retrying `retry_on` errors with backoff.
+
+    Gives up (re-raising the last error) after `policy.attempts` tries or
+    when the run's `budget` is spent.
+    """
+    policy = policy or RetryPolicy()
+    attempt = 0
+    while True:
+        try:
+            return await call()
+        except retry_on as e:
+            attempt += 1
+            if attempt >= policy.attempts:
+                log.error(f"[{label}] Giving up after {attempt} attempts: {e}")
+                raise
+            if budget is not None and not budget.take():
+                log.error(f"[{label}] Retry budget exhausted: {e}")
+                raise
+            delay = policy.delay(attempt - 1)
+            log.warning(f"[{label}] Attempt {attempt} failed ({e}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
@@ -0,0 +1,167 @@
+# core/scheduler.py
+
+import asyncio
+import datetime
+import random
+import time
+
+from core.crawl_planner import LEAGUE_PAGES
+from core.refresh_queue import RefreshQueue
+from core.utils import get_logger
+
+log = get_logger()
+
+# Fallback seconds between refreshes per planner sport key, used until the
+# refresh queue has kickoff/volatility data. Daily pages move close to kickoff;
+# the season-long league pages barely change within an hour.
+SPORT_CADENCES = {
+    "football": 5 * 60,
+    "basketball": 5 * 60,
+    "tennis": 5 * 60,
+    "futsal": 10 * 60,
+    "baseball": 10 * 60,
+    "nfl": 60 * 60,
+    "ncaa": 60 * 60,
+    "wnba": 60 * 60,
+}
+
+# Daily listings kept fresh per sport, as days from today (UTC). Today's is
+# where kickoffs are close, so it gets the short near-kickoff intervals.
+DAY_OFFSETS = {"today": 0, "tomorrow": 1}
+
+# +/- fraction applied to every delay so sports don't fire in lockstep
+JITTER = 0.15
+
+# Browser-heavy jobs allowed at once across all sports
+MAX_CONCURRENT_JOBS = 2
+
+
+def listing_keys(sports) -> dict:
+    """Scheduler task per listing: "football-today" -> ("football", 0); league pages have no date."""
+    keys = {}
+    for sport in sports:
+        if sport in LEAGUE_PAGES:
+            keys[sport] = (sport, None)
+        else:
+            for name, offset in DAY_OFFSETS.items():
+                keys[f"{sport}-{name}"] = (sport, offset)
+    return keys
+
+
+class ScrapeScheduler:
+    """Feeds per-listing refreshes through a RefreshQueue inside the API's event loop.
+
+    `run_listing(sport, day)` refreshes one sport's listing for `day` (None
+    for a league page) and returns its matches; their kickoffs and odds
+    movement decide when that listing comes up again. The sport's cadence is
+    used until there is data, and after failures.
+    """
+
+    def __init__(self, run_listing, cadences=None, jitter=JITTER, max_concurrent=MAX_CONCURRENT_JOBS,
+                 queue=None):
+        self.run_listing = run_listing
+        self.cadences = dict(cadences or SPORT_CADENCES)
+        self.listings = listing_keys(self.cadences)
+        self.jitter = jitter
+        self.max_concurrent = max_concurrent
+        self.queue = queue or RefreshQueue()
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._dispatcher = None
+        self._jobs = set()
+        self._running = set()
+        self._status = {key: {"last_run": None, "last_duration": None, "last_count": None,
+                              "last_error": None, "last_interval": None}
+                        for key in self.listings}
+
+    @property
+    def is_running(self) -> bool:
+        return self._dispatcher is not None
+
+    def _jittered(self, delay: float) -> float:
+        return max(1.0, delay * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def start(self):
+        if self._dispatcher:
+            return
+        now = time.time()
+        for key in self.listings:
+            # Stagger the first runs instead of launching every browser at once
+            self.queue.schedule(key, now + random.uniform(0, min(self._cadence(key), 60)))
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        log.info(f"[SCHEDULER] Started for {len(self.listings)} listings")
+
+    async def stop(self):
+        """Cancel the dispatcher and any jobs in flight; safe to call when not running."""
+        was_running = self.is_running
+        tasks = [self._dispatcher, *self._jobs] if self._dispatcher else list(self._jobs)
+        self._dispatcher = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for key in self.listings:
+            self.queue.remove(key)
+        if was_running:
+            log.info("[SCHEDULER] Stopped")
+
+    def _cadence(self, key: str) -> float:
+        return self.cadences[self.listings[key][0]]
+
+    async def _dispatch(self):
+        while True:
+            # Take a slot first so the most urgent task at that moment gets it
+            await self._semaphore.acquire()
+            try:
+                key = await self.queue.get()
+            except BaseException:
+                self._semaphore.release()
+                raise
+            job = asyncio.create_task(self._run_queued(key))
+            self._jobs.add(job)
+            job.add_done_callback(self._jobs.discard)
+
+    async def _run_queued(self, key: str):
+        try:
+            matches = await self._run(key)
+            if matches is None:
+                interval = self._jittered(self._cadence(key))
+            else:
+                interval = self._jittered(self.queue.observe(key, matches, self._cadence(key)))
+            self.queue.schedule(key, time.time() + interval)
+            self._status[key]["last_interval"] = interval
+        finally:
+            self.queue.done(key)
+            self._semaphore.release()
+
+    async def _run(self, key: str):
+        """Run one refresh; returns the matches, or None if it failed or overlapped."""
+        if key in self._running:
+            log.warning(f"[SCHEDULER] {key} refresh still running, skipping this slot")
+            return None
+
+        self._running.add(key)
+        status = self._status.setdefault(key, {})
+        sport, offset = self.listings[key]
+        # Resolved per run, so "today" rolls over at midnight
+        day = None if offset is None else datetime.datetime.utcnow().date() + datetime.timedelta(days=offset)
+        started = time.time()
+        try:
+            matches = await self.run_listing(sport, day)
+            status.update(last_count=len(matches), last_error=None)
+            return matches
+        except Exception as e:
+            status["last_error"] = str(e)
+            log.error(f"[SCHEDULER] {key} refresh failed: {e}")
+            return None
+        finally:
+            status.update(last_run=started, last_duration=time.time() - started)
+            self._running.discard(key)
+
+    def status(self) -> dict:
+        return {
+            "running": self.is_running,
+            "queue": self.queue.metrics(),
+            "listings": {
+                key: {**info, "cadence": self._cadence(key), "in_flight": key in self._running}
+                for key, info in self._status.items()
+            },
+        }
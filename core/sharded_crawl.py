@@ -0,0 +1,151 @@
+# core/sharded_crawl.py
+
+import asyncio
+import multiprocessing
+import os
+import queue
+from collections import defaultdict
+
+from core.browser_profile import PROFILES_ENABLED, BrowserProfiles
+from core.crawl_planner import CrawlState, dedupe_matches, plan_crawl
+from core.fetch_matches import crawl_listing
+from core.metrics import stage_timer
+from core.team_names import save_team_index
+from core.retry import DEFAULT_HOST_INTERVAL, DEFAULT_RUN_BUDGET, HostRateLimiter, RetryBudget
+from core.utils import get_logger, log_context
+from utils.proxy_pool import ProxyManager
+
+log = get_logger()
+
+# Seconds the parent waits on the result queue before checking its workers are alive
+POLL_INTERVAL = 1.0
+
+
+def shard_tasks(tasks, processes: int) -> list[list]:
+    """Split listings into at most `processes` shards.
+
+    Whole sports go to the least loaded shard when there are enough of them;
+    with fewer sports than processes the date partitions are dealt out instead.
+    """
+    by_sport = defaultdict(list)
+    for task in tasks:
+        by_sport[task.output_subfolder].append(task)
+
+    shards = [[] for _ in range(min(processes, len(tasks)))]
+    if len(by_sport) >= len(shards):
+        for group in sorted(by_sport.values(), key=len, reverse=True):
+            min(shards, key=len).extend(group)
+    else:
+        for i, task in enumerate(tasks):
+            shards[i % len(shards)].append(task)
+    return [shard for shard in shards if shard]
+
+
+async def _crawl_shard(tasks, results, user_agent=None, proxy=None, use_proxies=False,
+                       concurrency=3, retry_budget=DEFAULT_RUN_BUDGET,
+                       host_interval=DEFAULT_HOST_INTERVAL, force=False):
+    state = CrawlState()
+    semaphore = asyncio.Semaphore(concurrency)
+    budget = RetryBudget(retry_budget)
+    rate_limiter = HostRateLimiter(host_interval)
+    proxy_manager = ProxyManager() if use_proxies else None
+    # Slots are file-locked, so every shard draws from the same profile directory
+    profiles = BrowserProfiles() if PROFILES_ENABLED else None
+
+    async def run(task):
+        matches = await crawl_listing(task, state, semaphore, user_agent=user_agent, proxy=proxy,
+                                      proxy_manager=proxy_manager, budget=budget,
+                                      rate_limiter=rate_limiter, profiles=profiles, force=force)
+        # Stream each listing back as soon as it's done
+        results.put(("listing", task.key, matches))
+
+    try:
+        await asyncio.gather(*[run(task) for task in tasks])
+    finally:
+        state.save()
+        save_team_index()
+        if profiles:
+            profiles.log_report()
+
+
+def _run_shard(shard_id: int, tasks, results, options: dict):
+    """Worker process entry point: one event loop and one Playwright per shard."""
+    with log_context(shard=shard_id):
+        try:
+            asyncio.run(_crawl_shard(tasks, results, **options))
+        except BaseException as e:
+            log.error(f"[SHARD {shard_id}] Crashed: {e}")
+        finally:
+            results.put(("done", shard_id, None))
+
+
+async def iter_sharded_results(tasks, processes: int, **options):
+    """Run the listings across worker processes, yielding (listing key, matches) as each finishes."""
+    # spawn, not fork: the parent has an event loop and logging threads running
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    shards = shard_tasks(tasks, processes)
+    workers = [ctx.Process(target=_run_shard, args=(i, shard, results, options), name=f"shard-{i}")
+               for i, shard in enumerate(shards)]
+    for worker in workers:
+        worker.start()
+    log.info(f"[SHARD] {len(tasks)} listings across {len(workers)} processes: "
+             f"{[len(shard) for shard in shards]}")
+
+    loop = asyncio.get_running_loop()
+    running = set(range(len(workers)))
+    try:
+        while running:
+            try:
+                kind, key, matches = await loop.run_in_executor(None, results.get, True, POLL_INTERVAL)
+            except queue.Empty:
+                # A worker killed outright (OOM, segfault) never reports done
+                for i in list(running):
+                    if not workers[i].is_alive():
+                        log.error(f"[SHARD {i}] Exited with code {workers[i].exitcode} before finishing")
+                        running.discard(i)
+                continue
+            if kind == "done":
+                running.discard(key)
+            else:
+                yield key, matches
+    finally:
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+
+
+async def fetch_matches_sharded(user_agent=None, start_date=None, end_date=None, sports=None,
+                                processes=None, concurrency=3, proxy=None, use_proxies=False,
+                                retry_budget=DEFAULT_RUN_BUDGET, force=False) -> list[dict]:
+    """fetch_matches spread over a process pool, so a full crawl uses every core.
+
+    Each process runs its shard with its own Playwright, crawl state, retry
+    budget (a share of `retry_budget`) and proxy manager when `use_proxies`.
+    The per-host request spacing is stretched by the process count so the
+    site sees the same overall rate as a single-process crawl.
+    """
+    tasks = plan_crawl(start_date, end_date, sports)
+    if not tasks:
+        return []
+    processes = max(1, min(processes or os.cpu_count() or 1, len(tasks)))
+    options = dict(
+        user_agent=user_agent,
+        proxy=proxy,
+        use_proxies=use_proxies,
+        concurrency=concurrency,
+        retry_budget=max(1, retry_budget // processes),
+        host_interval=DEFAULT_HOST_INTERVAL * processes,
+        force=force,
+    )
+
+    collected = []
+    with stage_timer("fetch_matches"):
+        async for key, matches in iter_sharded_results(tasks, processes, **options):
+            log.info(f"[SHARD] {key}: {len(matches)} matches")
+            collected.extend(matches)
+
+    all_matches = dedupe_matches(collected)
+    log.info(f"[*] {len(all_matches)} unique matches from {len(collected)} rows")
+    return all_matches
@@ -0,0 +1,192 @@
+# core/team_names.py
+
+import fcntl
+import json
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+from functools import lru_cache
+
+from core.utils import get_logger
+
+log = get_logger()
+
+ALIASES_FILE = os.getenv("TEAM_ALIASES_FILE", os.path.join("./output", "team_aliases.json"))
+# Trigram (Dice) similarity an unseen name needs to join an existing team
+FUZZY_THRESHOLD = 0.8
+# Trigrams shared by more names than this are too common to narrow the search, so
+# their postings are dropped
+MAX_POSTINGS = 200
+# Raw (sport, name) lookups remembered in memory
+RESOLVED_ENTRIES = 65536
+
+# Club-type affixes that don't tell teams apart
+NOISE_TOKENS = {"fc", "cf", "afc", "sc", "ac", "cd", "fk", "sk", "bk", "club", "the"}
+# Spelled-out forms, so "Germany W" and "Germany Women" share a key
+TOKEN_ALIASES = {"w": "women", "womens": "women", "ladies": "women", "utd": "united", "st": "saint"}
+# Tokens that make a different side of the same club: women's, reserves, youth (plus any number,
+# and any initial, so "Williams S." and "Williams V." stay two players)
+MARKER_TOKENS = {"women", "ii", "iii", "b", "reserves"}
+
+
+@lru_cache(maxsize=RESOLVED_ENTRIES)
+def name_key(name: str) -> str:
+    """Normalized lookup key: accents, case, punctuation and club affixes removed."""
+    text = unicodedata.normalize("NFKD", name.replace("&", " and "))
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    tokens = [TOKEN_ALIASES.get(token, token) for token in re.findall(r"\w+", text)]
+    kept = [token for token in tokens if token not in NOISE_TOKENS]
+    return " ".join(kept or tokens)
+
+
+def name_markers(key: str) -> frozenset:
+    """Tokens two keys must share exactly to be the same team, however close the rest is."""
+    return frozenset(token for token in key.split()
+                     if token in MARKER_TOKENS or len(token) == 1 or any(c.isdigit() for c in token))
+
+
+def trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def team_id(sport: str, key: str) -> str:
+    return f"{sport.lower().replace(' ', '-')}:{key.replace(' ', '-')}"
+
+
+class TeamIndex:
+    """Canonical team ids per sport: exact lookups on normalized keys, trigram search for new names.
+
+    Every key a team has been seen under is saved as an alias, so a name
+    matched fuzzily once is an exact hit from then on. Candidates for a new
+    name come from a trigram inverted index, so resolving never compares
+    against every known team.
+    """
+
+    def __init__(self, path=ALIASES_FILE, threshold=FUZZY_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.teams = {}  # id -> {"name", "sport", "aliases"}
+        self._by_key = {}  # (sport, key) -> id
+        self._postings = {}  # (sport, trigram) -> keys, or None once too common to use
+        self._gram_counts = {}  # key -> number of trigrams
+        self._resolved = OrderedDict()  # (sport, raw name) -> id
+        self._lock = threading.Lock()
+        self.dirty = False
+        self.counts = {"cached": 0, "exact": 0, "fuzzy": 0, "new": 0}
+        self._merge(self._read())
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("teams", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _merge(self, teams: dict):
+        for ident, team in teams.items():
+            current = self.teams.setdefault(ident, {"name": team["name"], "sport": team["sport"], "aliases": []})
+            # Hand-edited aliases may be raw names; keys are normalized on the way in
+            for alias in team.get("aliases", []):
+                self._add_alias(ident, current["sport"], name_key(alias))
+
+    def _add_alias(self, ident: str, sport: str, key: str):
+        if (sport, key) in self._by_key:
+            return
+        self._by_key[(sport, key)] = ident
+        self.teams[ident]["aliases"].append(key)
+        grams = trigrams(key)
+        self._gram_counts[key] = len(grams)
+        for gram in grams:
+            keys = self._postings.setdefault((sport, gram), set())
+            if keys is not None:
+                keys.add(key)
+                if len(keys) > MAX_POSTINGS:
+                    self._postings[(sport, gram)] = None
+
+    def _fuzzy(self, sport: str, key: str):
+        grams = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            keys = self._postings.get((sport, gram))
+            if keys:
+                shared.update(keys)
+
+        markers = name_markers(key)
+        best, best_score = None, self.threshold
+        for candidate, common in shared.most_common(20):
+            score = 2 * common / (len(grams) + self._gram_counts[candidate])
+            if score >= best_score and name_markers(candidate) == markers:
+                best, best_score = candidate, score
+        return self._by_key[(sport, best)] if best else None
+
+    def resolve(self, name: str, sport: str = "") -> str | None:
+        """The canonical id for `name` in `sport`, adding a new team when nothing is close enough."""
+        if not name:
+            return None
+        sport = sport or ""
+        with self._lock:
+            ident = self._resolved.get((sport, name))
+            if ident is not None:
+                self._resolved.move_to_end((sport, name))
+                self.counts["cached"] += 1
+                return ident
+
+            key = name_key(name)
+            ident = self._by_key.get((sport, key))
+            if ident is not None:
+                self.counts["exact"] += 1
+            else:
+                ident = self._fuzzy(sport, key)
+                if ident is not None:
+                    self.counts["fuzzy"] += 1
+                    log.debug(f"[TEAMS] {name!r} matched {self.teams[ident]['name']!r}")
+                else:
+                    ident = team_id(sport, key)
+                    self.teams.setdefault(ident, {"name": name, "sport": sport, "aliases": []})
+                    self.counts["new"] += 1
+                self._add_alias(ident, sport, key)
+                self.dirty = True
+
+            self._resolved[(sport, name)] = ident
+            if len(self._resolved) > RESOLVED_ENTRIES:
+                self._resolved.popitem(last=False)
+            return ident
+
+    def save(self):
+        """Merge with whatever other processes saved meanwhile and write the alias file."""
+        with self._lock:
+            if not self.dirty:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path + ".lock", "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                self._merge(self._read())
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"teams": self.teams}, f, ensure_ascii=False, indent=1)
+                os.replace(tmp_path, self.path)
+            self.dirty = False
+        log.info(f"[TEAMS] Saved {len(self.teams)} teams; this run {self.counts}")
+
+
+_index = None
+
+
+def get_team_index() -> TeamIndex:
+    """Process-wide index shared by every match record built here."""
+    global _index
+    if _index is None:
+        _index = TeamIndex()
+    return _index
+
+
+def canonical_team(name: str, sport: str = "") -> str | None:
+    return get_team_index().resolve(name, sport)
+
+
+def save_team_index():
+    if _index is not None:
+        _index.save()
@@ -0,0 +1,68 @@
+# core/url_parser.py
+
+from functools import lru_cache
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+# OddsPortal sport slugs -> display names. Order does not matter because we
+# match whole path segments, so "american-football" can never become "Football".
+SPORT_NAMES = {
+    "football": "Football",
+    "american-football": "American Football",
+    "basketball": "Basketball",
+    "tennis": "Tennis",
+    "futsal": "Futsal",
+    "baseball": "Baseball",
+    "hockey": "Hockey",
+    "volleyball": "Volleyball",
+    "handball": "Handball",
+}
+
+
+class MatchPath(NamedTuple):
+    sport: str
+    country: str
+    competition: str
+    match_id: str
+
+
+def slug_to_name(slug: str) -> str:
+    return " ".join(part.capitalize() for part in slug.split("-") if part)
+
+
+@lru_cache(maxsize=16384)
+def parse_match_url(url: str) -> MatchPath:
+    """Split an OddsPortal URL path into sport, country, competition and match id.
+
+    Handles match pages (/football/europe/euro-women/germany-poland-jkozGyfC/),
+    league pages (/american-football/usa/nfl/) and daily listings
+    (/matches/football/20250705/).
+    """
+    segments = [s for s in urlsplit(url or "").path.lower().split("/") if s]
+
+    if segments and segments[0] == "matches":
+        segments = segments[1:2]
+
+    if not segments:
+        return MatchPath("Unknown", "", "", "")
+
+    sport_slug = segments[0]
+    sport = SPORT_NAMES.get(sport_slug, slug_to_name(sport_slug))
+    country = slug_to_name(segments[1]) if len(segments) > 1 else ""
+    competition = slug_to_name(segments[2]) if len(segments) > 2 else ""
+
+    match_id = ""
+    if len(segments) > 3 and "-" in segments[3]:
+        # The id is the case-sensitive suffix of the slug, so take it from the raw path
+        raw_slug = [s for s in urlsplit(url).path.split("/") if s][3]
+        match_id = raw_slug.rsplit("-", 1)[1]
+
+    return MatchPath(sport, country, competition, match_id)
+
+
+def match_key(match: dict) -> str:
+    """Stable identity for a match: the OddsPortal slug suffix when we have one.
+
+    Kept here, free of scraper imports, so the API client can use it on any platform.
+    """
+    return match.get("match_id") or f"{match.get('match_url', '')}|{match.get('team1', '')}|{match.get('team2', '')}"
@@ -1,6 +1,17 @@
 # core/utils.py
 
+import atexit
+import contextvars
+import copy
+import json
 import logging
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
 
 SUCCESS_LEVEL = 25  # Between INFO (20) and WARNING (30)
 logging.addLevelName(SUCCESS_LEVEL, "SUCCESS")
@@ -11,14 +22,170 @@ def success(self, message, *args, **kwargs):
 
 logging.Logger.success = success
 
+# "json" for containers/log shippers, "text" for the old "[LEVEL] message" lines
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+TEXT_FORMAT = "[%(levelname)s] %(message)s"
+
+# Per warning template: this many records per window, then one summary line
+RATE_LIMIT_BURST = int(os.getenv("LOG_RATE_LIMIT_BURST", "5"))
+RATE_LIMIT_WINDOW = float(os.getenv("LOG_RATE_LIMIT_WINDOW", "10"))
+# Windows a site holding an unreported suppression count is kept waiting for its next record
+RATE_LIMIT_KEEP_WINDOWS = 30
+
+# Fields like sport/job attached to every record logged inside log_context()
+_log_context = contextvars.ContextVar("log_context", default={})
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach fields (sport=..., job=...) to every record logged in this block/task."""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record):
+        record.context = _log_context.get()
+        return True
+
+
+# Numbers and quoted values in an f-string message, masked to recover its template
+_VARIABLE_PARTS = re.compile(r"'[^']*'|\"[^\"]*\"|\d+(?:\.\d+)?")
+
+
+def message_template(record) -> str:
+    """The record's message with its variable parts masked ("Failed to parse match # ...")."""
+    return _VARIABLE_PARTS.sub("#", str(record.msg))
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets a burst of repeated warnings through per window and drops the rest.
+
+    Row-level warnings inside the scrape loops repeat one template, so a
+    broken page produces a handful of lines plus a suppression count instead
+    of one line per row. Other levels always pass.
+    """
+
+    def __init__(self, burst=RATE_LIMIT_BURST, window=RATE_LIMIT_WINDOW):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._sites = {}
+        self._next_prune = time.monotonic() + window
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        """Forget sites whose window has expired, so one-off warnings don't pile up.
+
+        A site with a suppression count still to report is kept for a few
+        more windows in case it warns again.
+        """
+        keep = self.window * RATE_LIMIT_KEEP_WINDOWS
+        self._sites = {
+            key: site for key, site in self._sites.items()
+            if now - site[0] < (keep if site[2] else self.window)
+        }
+        self._next_prune = now + self.window
+
+    def filter(self, record):
+        if record.levelno != logging.WARNING:
+            return True
+        key = (record.name, record.pathname, record.lineno, message_template(record))
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_prune:
+                self._prune(now)
+            started, count, suppressed = self._sites.get(key, (now, 0, 0))
+            if now - started >= self.window:
+                if suppressed:
+                    record.suppressed = suppressed
+                started, count, suppressed = now, 0, 0
+            if count < self.burst:
+                self._sites[key] = (started, count + 1, suppressed)
+                return True
+            self._sites[key] = (started, count, suppressed + 1)
+            return False
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "context", {}))
+        if getattr(record, "suppressed", 0):
+            entry["suppressed_since_last"] = record.suppressed
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        line = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{line} (+{suppressed} similar suppressed)" if suppressed else line
+
+
+_queue = None
+_listener = None
+_listener_pid = None
+_listener_lock = threading.Lock()
+
+
+def _current_queue():
+    """The process's log queue, (re)starting its listener thread after a fork."""
+    global _queue, _listener, _listener_pid
+    if _listener_pid == os.getpid():
+        return _queue
+    with _listener_lock:
+        if _listener_pid != os.getpid():
+            handler = logging.StreamHandler()
+            handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter(TEXT_FORMAT))
+            _queue = queue.SimpleQueue()
+            _listener = QueueListener(_queue, handler, respect_handler_level=True)
+            _listener.start()
+            _listener_pid = os.getpid()
+            atexit.register(_listener.stop)
+    return _queue
+
+
+class AsyncQueueHandler(QueueHandler):
+    """Hands records to a background thread so slow stdout never blocks the event loop."""
+
+    def __init__(self):
+        super().__init__(None)
+
+    def prepare(self, record):
+        # Render the message now but keep the traceback apart for the formatter
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        _current_queue().put_nowait(record)
+
+
 def get_logger(name="scraper"):
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
 
     if not logger.hasHandlers():  # Prevent duplicate handlers
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter("[%(levelname)s] %(message)s")
-        handler.setFormatter(formatter)
+        handler = AsyncQueueHandler()
+        handler.addFilter(RateLimitFilter())
+        handler.addFilter(ContextFilter())
         logger.addHandler(handler)
 
-    return logger
\ No newline at end of file
+    return logger
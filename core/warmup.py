@@ -0,0 +1,84 @@
+# core/warmup.py
+
+import asyncio
+import importlib
+import os
+import time
+
+from core.utils import get_logger
+
+log = get_logger()
+
+# Loaded after the server is listening; pandas and Playwright alone cost more
+# than the rest of the API put together
+SCRAPER_MODULES = ("core.fetch_matches", "core.sharded_crawl")
+
+
+class Warmup:
+    """Loads the scraper in the background and tracks whether it can run yet.
+
+    The API answers /health as soon as it binds; `ready` turns true once the
+    scraper modules are imported and Playwright's Chromium is installed.
+    """
+
+    def __init__(self, modules=SCRAPER_MODULES):
+        self.modules = modules
+        self.stage = "pending"
+        self.error = None
+        self.timings = {}
+        self._started = time.monotonic()
+        self._ready_after = None
+        self._imported = None
+
+    @property
+    def ready(self) -> bool:
+        return self.stage == "ready"
+
+    async def load(self):
+        """Import the scraper modules once, off the event loop; concurrent callers share the import."""
+        if self._imported is None:
+            self._imported = asyncio.ensure_future(asyncio.to_thread(self._import))
+        await asyncio.shield(self._imported)
+
+    def _import(self):
+        for name in self.modules:
+            started = time.monotonic()
+            importlib.import_module(name)
+            self.timings[name] = round(time.monotonic() - started, 3)
+
+    async def _check_browser(self):
+        from playwright.async_api import async_playwright
+
+        async with async_playwright() as pw:
+            path = pw.chromium.executable_path
+        if not os.path.exists(path):
+            raise RuntimeError(f"Chromium not found at {path}; run `playwright install chromium`")
+
+    async def run(self):
+        """Import the scraper, then check the browser; records a failure instead of raising."""
+        try:
+            self.stage = "importing"
+            await self.load()
+            self.stage = "browser"
+            started = time.monotonic()
+            await self._check_browser()
+            self.timings["browser"] = round(time.monotonic() - started, 3)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error(f"[WARMUP] Scraper unavailable ({self.stage} failed): {e}")
+            self.stage = "failed"
+            self.error = str(e)
+            return
+        self.stage = "ready"
+        self._ready_after = round(time.monotonic() - self._started, 3)
+        log.info(f"[WARMUP] Scraper ready {self._ready_after}s after import: {self.timings}")
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "stage": self.stage,
+            "error": self.error,
+            "ready_after": self._ready_after,
+            "timings": self.timings,
+        }
@@ -0,0 +1,70 @@
+# tests/test_feed_capture.py
+
+import json
+import os
+
+import pytest
+
+from core.feed_capture import FeedCapture, decode_feed, feed_rows
+from core.team_names import TeamIndex
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "format", "feed_nextgames.json")
+
+
+def load_fixture():
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def feed_row(**fields):
+    return {"home-name": "Arsenal", "away-name": "Chelsea",
+            "url": "/football/england/premier-league/arsenal-chelsea-AbCd1234/",
+            "odds": [{"avgOdds": 2.1}, {"avgOdds": 3.4}, {"avgOdds": 3.3}], **fields}
+
+
+@pytest.fixture(autouse=True)
+def team_aliases(tmp_path, monkeypatch):
+    # build_match canonicalizes team names; keep that index off the real alias file
+    monkeypatch.setattr("core.team_names._index", TeamIndex(path=str(tmp_path / "team_aliases.json")))
+
+
+def test_missing_timestamp_leaves_kickoff_empty():
+    (match,) = decode_feed({"d": {"rows": [feed_row()]}})
+    assert match["datetime"] == ""
+
+
+def test_timestamp_is_utc_kickoff():
+    (match,) = decode_feed({"rows": [feed_row(**{"date-start-timestamp": 1767225600})]})
+    assert match["datetime"] == "2026-01-01T00:00:00+00:00"
+    assert match["odds"] == ["2.10", "3.40", "3.30"]
+
+
+def test_fixture_decodes_every_row():
+    matches = decode_feed(load_fixture())
+    assert len(matches) == 8
+    first = matches[0]
+    assert first["match_id"] == "jkozGyfC"
+    assert first["team1"] == "Germany W"
+    assert first["odds"] == ["1.08", "11.46", "24.69"]
+    assert first["bookmakers"] == 17
+    assert first["datetime"] == "2025-07-05T00:00:00+00:00"
+    assert matches[4]["odds"] == ["2.38", "3.60", "2.52"]
+    assert [m["match_id"] for m in matches] == [row["encodeEventId"] for row in feed_rows(load_fixture())]
+
+
+class FakePage:
+    def on(self, event, handler):
+        pass
+
+
+def test_fingerprint_ignores_response_order():
+    rows = feed_rows(load_fixture())
+    payloads = [{"d": {"rows": rows[:3]}}, {"rows": rows[3:]}]
+
+    first, second = FeedCapture(FakePage()), FeedCapture(FakePage())
+    first.payloads = payloads
+    second.payloads = list(reversed(payloads))
+    assert first.fingerprint() == second.fingerprint() is not None
+
+    second.payloads = [{"rows": rows[:-1]}]
+    assert second.fingerprint() != first.fingerprint()
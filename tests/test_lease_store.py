@@ -0,0 +1,60 @@
+# tests/test_lease_store.py
+
+import time
+
+import pytest
+
+from core.lease_store import LeaseStore
+
+LEASE_SECONDS = 0.05
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LeaseStore(str(tmp_path / "leases.sqlite"), lease_seconds=LEASE_SECONDS, max_attempts=2)
+
+
+def expire():
+    time.sleep(LEASE_SECONDS * 2)
+
+
+def test_expired_claim_goes_to_another_worker(store):
+    store.submit("crawl", [("football-20260101", "listing", {"sport": "football"})])
+    (first,) = store.claim("a")
+    assert store.claim("b") == []
+
+    expire()
+    (second,) = store.claim("b")
+    assert second.key == first.key
+    assert second.attempts == 2
+
+
+def test_stale_holder_cannot_complete(store):
+    store.submit("crawl", [("nfl", "listing", {})])
+    (stale,) = store.claim("a")
+    expire()
+    (current,) = store.claim("b")
+
+    assert store.complete("a", stale, ["old"]) is False
+    assert store.complete("b", current, ["new"]) is True
+    assert store.results("crawl", "listing") == {"nfl": ["new"]}
+
+
+def test_item_fails_after_max_attempts(store):
+    store.submit("crawl", [("tennis-20260101", "listing", {})])
+    (lease,) = store.claim("a")
+    store.fail("a", lease, "timeout")
+    (lease,) = store.claim("b")
+    expire()
+
+    # The second claim ran out on the last attempt, so it is given up rather than handed out again
+    assert store.claim("c") == []
+    assert store.progress("crawl") == {"listing": {"failed": 1}}
+
+
+def test_submit_is_idempotent_per_crawl(store):
+    items = [("wnba", "listing", {}), ("ncaa", "listing", {})]
+    assert store.submit("crawl", items) == 2
+    assert store.submit("crawl", items) == 0
+    assert store.submit("other-crawl", items) == 2
+    assert store.progress("crawl") == {"listing": {"pending": 2}}
@@ -0,0 +1,42 @@
+# tests/test_match_time.py
+
+from datetime import datetime, timezone
+
+from core.match_time import parse_kickoffs
+
+REFERENCE = datetime(2025, 7, 4, 12, 0, tzinfo=timezone.utc)
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_tomorrow_header_at_midnight():
+    assert parse_kickoffs(["Tomorrow, 05 Jul"], ["00:00"], reference=REFERENCE) == [utc(2025, 7, 5, 0, 0)]
+
+
+def test_header_with_stage_suffix():
+    assert parse_kickoffs(["Today, 04 Jul  - Play Offs"], ["19:45"], reference=REFERENCE) == \
+        [utc(2025, 7, 4, 19, 45)]
+
+
+def test_explicit_year_is_kept():
+    # Far from the reference, but printed, so not re-guessed
+    assert parse_kickoffs(["05 Jul 2027"], ["18:30"], reference=REFERENCE) == [utc(2027, 7, 5, 18, 30)]
+
+
+def test_year_rolls_over_from_december_to_january():
+    reference = datetime(2025, 12, 31, 22, 0, tzinfo=timezone.utc)
+    assert parse_kickoffs(["31 Dec", "Tomorrow, 01 Jan"], ["23:00", "01:00"], reference=reference) == \
+        [utc(2025, 12, 31, 23, 0), utc(2026, 1, 1, 1, 0)]
+
+
+def test_january_reference_looks_back_to_december():
+    reference = datetime(2026, 1, 1, 9, 0, tzinfo=timezone.utc)
+    assert parse_kickoffs(["31 Dec"], ["20:00"], reference=reference) == [utc(2025, 12, 31, 20, 0)]
+
+
+def test_unparseable_rows_are_none():
+    kickoffs = parse_kickoffs(["Tomorrow, 05 Jul", None, "Postponed", "05 Jul"],
+                              [None, "12:00", "12:00", "FT"], reference=REFERENCE)
+    assert kickoffs == [None, None, None, None]
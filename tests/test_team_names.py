@@ -0,0 +1,32 @@
+# tests/test_team_names.py
+
+import pytest
+
+from core.team_names import TeamIndex, name_markers
+
+
+@pytest.fixture
+def index(tmp_path):
+    return TeamIndex(path=str(tmp_path / "team_aliases.json"))
+
+
+@pytest.mark.parametrize("first, second", [
+    ("Williams S.", "Williams V."),
+    ("Djokovic N.", "Djokovic M."),
+])
+def test_players_differing_by_initial_stay_apart(index, first, second):
+    assert index.resolve(first, "Tennis") != index.resolve(second, "Tennis")
+
+
+def test_same_initial_resolves_to_one_player(index):
+    assert index.resolve("Williams S.", "Tennis") == index.resolve("Williams S", "Tennis")
+
+
+def test_close_spelling_still_matches(index):
+    assert index.resolve("Borussia Monchengladbach", "Football") == \
+        index.resolve("Borussia Moenchengladbach", "Football")
+
+
+def test_initials_are_markers():
+    assert name_markers("williams s") == {"s"}
+    assert name_markers("djokovic n") != name_markers("djokovic m")
@@ -0,0 +1,118 @@
+# utils/api_client.py
+
+import json
+import threading
+import time
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.url_parser import match_key
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (5, 30)
+SCRAPE_TIMEOUT = (5, 900)
+
+# How long a GET response is served from memory before revalidating with the API
+CACHE_TTL = 60
+
+
+class ApiClient:
+    """Keep-alive HTTP client for the scraper API with ETag revalidation and a short TTL cache."""
+
+    def __init__(self, base_url, cache_ttl=CACHE_TTL, pool_size=4):
+        self.base_url = base_url.rstrip("/")
+        self.cache_ttl = cache_ttl
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
+
+        # path -> (expires_at, etag, payload)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _url(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get_json(self, path, ttl=None, timeout=DEFAULT_TIMEOUT):
+        ttl = self.cache_ttl if ttl is None else ttl
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._cache.get(path)
+        if cached and cached[0] > now:
+            return cached[2]
+
+        headers = {}
+        if cached and cached[1]:
+            headers["If-None-Match"] = cached[1]
+
+        response = self.session.get(self._url(path), headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and cached:
+            payload = cached[2]
+            etag = cached[1]
+        else:
+            response.raise_for_status()
+            payload = response.json()
+            etag = response.headers.get("ETag")
+
+        with self._lock:
+            self._cache[path] = (time.monotonic() + ttl, etag, payload)
+        return payload
+
+    def post_json(self, path, timeout=SCRAPE_TIMEOUT):
+        response = self.session.post(self._url(path), timeout=timeout)
+        response.raise_for_status()
+        # Anything we had cached is stale after a write
+        self.invalidate()
+        return response.json()
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(path, None)
+
+    def odds_updates(self, generation, sports=None, wait=1.0):
+        """Messages from /ws/odds since `generation`, collected until the stream is quiet for `wait` seconds."""
+        from websockets.sync.client import connect
+
+        params = {"generation": generation}
+        if sports:
+            params["sports"] = ",".join(sports)
+        url = self._url(f"/ws/odds?{urlencode(params)}").replace("http", "ws", 1)
+
+        messages = []
+        with connect(url, open_timeout=DEFAULT_TIMEOUT[0]) as ws:
+            while True:
+                try:
+                    messages.append(json.loads(ws.recv(timeout=wait)))
+                except TimeoutError:
+                    return messages
+
+    def close(self):
+        self.session.close()
+
+
+def apply_odds_delta(matches, delta):
+    """Apply one /ws/odds delta message to a cached match list; returns the new list."""
+    by_key = {match_key(m): m for m in matches}
+    for key in delta["removed"]:
+        by_key.pop(key, None)
+    for change in delta["changed"]:
+        match = by_key.get(change["id"])
+        if match is not None:
+            by_key[change["id"]] = {**match, **{k: v for k, v in change.items() if k != "id"}}
+    for added in delta["added"]:
+        by_key[added["id"]] = {k: v for k, v in added.items() if k != "id"}
+    return sorted(by_key.values(), key=lambda m: m.get("datetime") or "")
@@ -1,6 +1,10 @@
 # utils/proxy_pool.py
 
+import asyncio
+import os
 import random
+import time
+from contextlib import asynccontextmanager
 
 # Sample free proxies (rotate often or expand from proxy list APIs)
 FREE_PROXIES = [
@@ -11,5 +15,164 @@ FREE_PROXIES = [
     "http://64.225.8.132:9981"
 ]
 
+# Consecutive failures before a proxy's circuit opens
+FAILURE_THRESHOLD = 3
+# Seconds a proxy sits out after its circuit opens / after a ban
+COOLDOWN = 5 * 60
+BAN_COOLDOWN = 30 * 60
+# Weight given to the newest latency sample
+LATENCY_ALPHA = 0.3
+# Seconds acquire() waits for a circuit to close before giving up
+ACQUIRE_TIMEOUT = float(os.getenv("PROXY_ACQUIRE_TIMEOUT", "60"))
+
+
 def get_random_proxy():
     return random.choice(FREE_PROXIES)
+
+
+class ProxyBannedError(Exception):
+    """The target answered in a way that means this proxy is blocked (403/429)."""
+
+
+class ProxyUnavailableError(Exception):
+    """Every proxy stayed in cool-down past the acquire deadline."""
+
+
+class ProxyLease:
+    """A proxy held for one browser context; the scrape records how long its navigation took."""
+
+    __slots__ = ("proxy", "latency")
+
+    def __init__(self, proxy: str):
+        self.proxy = proxy
+        self.latency = None
+
+
+class ProxyStats:
+    __slots__ = ("successes", "failures", "bans", "consecutive_failures", "latency", "open_until")
+
+    def __init__(self):
+        self.successes = 0
+        self.failures = 0
+        self.bans = 0
+        self.consecutive_failures = 0
+        self.latency = None
+        self.open_until = 0.0
+
+    def success_rate(self) -> float:
+        # Laplace-smoothed so new proxies start at 0.5 instead of 0 or 1
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    def health(self) -> float:
+        latency = self.latency if self.latency is not None else 1.0
+        return self.success_rate() / (1.0 + latency)
+
+
+class ProxyManager:
+    """Health-weighted proxy selection with a cool-down circuit breaker per proxy."""
+
+    def __init__(self, proxies=None, failure_threshold=FAILURE_THRESHOLD,
+                 cooldown=COOLDOWN, ban_cooldown=BAN_COOLDOWN):
+        self.stats = {proxy: ProxyStats() for proxy in (proxies or FREE_PROXIES)}
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.ban_cooldown = ban_cooldown
+        self._in_use = {proxy: 0 for proxy in self.stats}
+        self._lock = asyncio.Lock()
+
+    def available(self, now=None) -> list[str]:
+        now = time.monotonic() if now is None else now
+        return [p for p, s in self.stats.items() if s.open_until <= now]
+
+    async def acquire(self, timeout=ACQUIRE_TIMEOUT) -> str:
+        """Pick a proxy weighted by health, preferring ones no context is using.
+
+        Waits for the earliest circuit to close if every proxy is cooling down,
+        but no longer than `timeout` seconds (ProxyUnavailableError).
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                candidates = self.available(now)
+                if candidates:
+                    idle = [p for p in candidates if not self._in_use[p]]
+                    pool = idle or candidates
+                    weights = [self.stats[p].health() for p in pool]
+                    proxy = random.choices(pool, weights=weights)[0]
+                    self._in_use[proxy] += 1
+                    return proxy
+                wait = min(s.open_until for s in self.stats.values()) - now
+            if now + wait > deadline:
+                raise ProxyUnavailableError(f"Every proxy is cooling down for at least {wait:.0f}s more")
+            await asyncio.sleep(max(wait, 0.1))
+
+    async def release(self, proxy: str, ok: bool, latency=None, banned=False):
+        async with self._lock:
+            self._in_use[proxy] = max(0, self._in_use[proxy] - 1)
+            stats = self.stats[proxy]
+            if ok:
+                stats.successes += 1
+                stats.consecutive_failures = 0
+                if latency is not None:
+                    stats.latency = latency if stats.latency is None else (
+                        LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * stats.latency)
+                return
+
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            if banned:
+                stats.bans += 1
+                stats.open_until = time.monotonic() + self.ban_cooldown
+            elif stats.consecutive_failures >= self.failure_threshold:
+                stats.open_until = time.monotonic() + self.cooldown
+                stats.consecutive_failures = 0
+
+    @asynccontextmanager
+    async def lease(self):
+        """Hold one proxy (a ProxyLease) for the life of a browser context, reporting the outcome.
+
+        Latency is whatever the holder set on the lease (the page navigation),
+        not the whole scrape, so a big listing doesn't make its proxy look slow.
+        """
+        leased = ProxyLease(await self.acquire())
+        proxy = leased.proxy
+        try:
+            yield leased
+        except ProxyBannedError:
+            await self.release(proxy, ok=False, banned=True)
+            raise
+        except asyncio.CancelledError:
+            # Not the proxy's fault; just hand it back
+            self._in_use[proxy] = max(0, self._in_use[proxy] - 1)
+            raise
+        except BaseException:
+            await self.release(proxy, ok=False)
+            raise
+        else:
+            await self.release(proxy, ok=True, latency=leased.latency)
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {
+            proxy: {
+                "health": round(s.health(), 4),
+                "success_rate": round(s.success_rate(), 4),
+                "latency": s.latency,
+                "bans": s.bans,
+                "in_use": self._in_use[proxy],
+                "cooling_down_for": max(0.0, s.open_until - now),
+            }
+            for proxy, s in self.stats.items()
+        }
+
+
+_manager = None
+
+
+def get_proxy_manager() -> ProxyManager:
+    """Process-wide manager so health scores survive across crawls."""
+    global _manager
+    if _manager is None:
+        _manager = ProxyManager()
+    return _manager